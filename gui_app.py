@@ -13,37 +13,54 @@ from tkinter import messagebox
 
 import pyperclip
 
-from mom_pipeline.live_capture import stream_audio
-from mom_pipeline.live_transcribe import transcribe_audio
+from mom_pipeline.live_transcribe import transcribe_while_recording
+from mom_pipeline.local_whisper import local_backend_enabled, start_warmup
 
 
-def run_transcription(api_key: str, language: str, status_var, text_var, btn):
-    if not api_key:
+def run_transcription(api_key: str, language: str, status_var, text_box, btn, stop_event: threading.Event, on_done):
+    if not api_key and not local_backend_enabled():
         messagebox.showerror("Missing API Key", "Please enter your OPENAI_API_KEY.")
+        on_done()
         return
 
-    os.environ["OPENAI_API_KEY"] = api_key
+    if api_key:
+        os.environ["OPENAI_API_KEY"] = api_key
+
+    def ui(fn, *args):
+        # Tk is not thread-safe: schedule every widget update on the main loop
+        text_box.after(0, fn, *args)
+
+    def copy_to_clipboard(text):
+        # pyperclip shells out to pbcopy; keep it off the transcription path
+        try:
+            pyperclip.copy(text)
+            ui(status_var.set, "Done. Transcript copied to clipboard.")
+        except Exception:
+            ui(status_var.set, "Done. Transcript ready (clipboard copy failed).")
 
     def worker():
+        def on_segment(seg):
+            # Append only the new segment instead of rewriting the whole transcript
+            ui(text_box.insert, tk.END, seg["text"] + " ")
+
         try:
-            status_var.set("Recording... Press Stop when done.")
-            btn.config(state=tk.DISABLED)
-            audio_bytes = stream_audio(duration=None)
-            status_var.set("Transcribing...")
-            full_text, _ = transcribe_audio(audio_bytes, language=language)
+            ui(status_var.set, "Recording... Press Stop when done.")
+            ui(btn.config, {"text": "Stop"})
+            ui(text_box.delete, "1.0", tk.END)
+            # Each window is transcribed while recording continues
+            _, full_text, _ = transcribe_while_recording(
+                language=language, on_segment=on_segment, stop_event=stop_event
+            )
             if not full_text.strip():
-                status_var.set("No speech detected.")
+                ui(status_var.set, "No speech detected.")
             else:
-                text_var.set(full_text)
-                try:
-                    pyperclip.copy(full_text)
-                    status_var.set("Done. Transcript copied to clipboard.")
-                except Exception:
-                    status_var.set("Done. Transcript ready (clipboard copy failed).")
+                ui(status_var.set, "Done (copying to clipboard in background)...")
+                threading.Thread(target=copy_to_clipboard, args=(full_text,), daemon=True).start()
         except Exception as e:
-            status_var.set(f"Error: {e}")
+            ui(status_var.set, f"Error: {e}")
         finally:
-            btn.config(state=tk.NORMAL)
+            ui(btn.config, {"text": "Record & Transcribe", "state": tk.NORMAL})
+            ui(on_done)
 
     threading.Thread(target=worker, daemon=True).start()
 
@@ -65,14 +82,32 @@ def main():
     status_var = tk.StringVar()
     status_var.set("Idle")
 
-    text_var = tk.StringVar()
+    recording = {"stop": None}
+
+    def on_done():
+        recording["stop"] = None
+
+    def toggle_recording():
+        if recording["stop"] is not None:
+            recording["stop"].set()
+            status_var.set("Finishing transcription...")
+            btn.config(state=tk.DISABLED)
+            return
+        recording["stop"] = threading.Event()
+        run_transcription(
+            api_entry.get().strip(),
+            lang_entry.get().strip() or "en",
+            status_var,
+            text_box,
+            btn,
+            recording["stop"],
+            on_done,
+        )
 
     btn = tk.Button(
         root,
         text="Record & Transcribe",
-        command=lambda: run_transcription(
-            api_entry.get().strip(), lang_entry.get().strip() or "en", status_var, text_var, btn
-        ),
+        command=toggle_recording,
         bg="#4CAF50",
         fg="white",
         padx=10,
@@ -87,11 +122,10 @@ def main():
     text_box = tk.Text(root, height=10, wrap="word")
     text_box.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
-    def on_text_var_change(*_):
-        text_box.delete("1.0", tk.END)
-        text_box.insert(tk.END, text_var.get())
-
-    text_var.trace_add("write", on_text_var_change)
+    # Load and warm the local Whisper model in the background so the window
+    # opens immediately and the first recording reuses the loaded model.
+    if local_backend_enabled():
+        start_warmup()
 
     root.mainloop()
 
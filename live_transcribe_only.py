@@ -1,15 +1,21 @@
 #!/usr/bin/env python
 """Simple live voice capture, transcription, and save (no MoM generation)."""
 import argparse
+import os
+import shutil
+import tempfile
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
 
 from dotenv import load_dotenv
 import pyperclip
 
-from mom_pipeline.live_capture import stream_audio
+from mom_pipeline.cache import get_cache, make_key
+from mom_pipeline.live_capture import stream_audio_array
 from mom_pipeline.live_transcribe import transcribe_audio
-from mom_pipeline.utils import ensure_dir, now_ts, safe_json_dump
+from mom_pipeline.utils import now_ts, write_files
 
 
 def main():
@@ -19,6 +25,7 @@ def main():
     parser.add_argument("--output-dir", default="outputs", help="Output directory")
     parser.add_argument("--language", default="en", help="Language code (en, es, fr, etc.)")
     parser.add_argument("--copy-to-clipboard", action="store_true", help="Copy transcript to clipboard for Copilot")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk transcript cache")
     args = parser.parse_args()
 
     print("\n=== Live Voice Recording & Transcription ===")
@@ -27,66 +34,86 @@ def main():
 
     start_time = time.time()
 
+    # The raw capture is streamed to this file while recording, then moved into out_dir
+    fd, tmp_wav = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+
+    def discard_audio():
+        if os.path.exists(tmp_wav):
+            os.remove(tmp_wav)
+
     try:
-        # Capture audio from mic with preprocessing
-        audio_bytes = stream_audio(duration=None)
+        # Capture audio from mic with preprocessing; keep raw samples, no WAV encode
+        audio, sample_rate = stream_audio_array(duration=None, wav_path=tmp_wav)
     except KeyboardInterrupt:
         print("\nCapture interrupted.")
+        discard_audio()
         return
 
     print("\nTranscribing with Whisper...")
-    try:
-        full_text, segments = transcribe_audio(audio_bytes, language=args.language)
-    except Exception as e:
-        print(f"Transcription error: {e}")
-        return
+    cache = None if args.no_cache else get_cache()
+    key = make_key(audio, "transcribe", args.language, False, os.getenv("WHISPER_BACKEND", ""))
+    hit = cache.get(key) if cache is not None else None
+    if hit is not None:
+        full_text, segments = hit
+    else:
+        try:
+            full_text, segments = transcribe_audio(audio, language=args.language, sample_rate=sample_rate)
+        except Exception as e:
+            print(f"Transcription error: {e}")
+            discard_audio()
+            return
+        if cache is not None and full_text.strip():
+            cache.set(key, [full_text, segments])
 
     if not full_text.strip():
         print("No speech detected. Exiting.")
+        discard_audio()
         return
 
     # Save outputs
-    ts = now_ts()
-    out_dir = f"{args.output_dir}/{ts}_recording"
-    ensure_dir(out_dir)
-
-    # Save raw audio file
-    with open(f"{out_dir}/audio_original.wav", "wb") as f:
-        f.write(audio_bytes)
-
-    # Save transcript
-    with open(f"{out_dir}/transcript.txt", "w") as f:
-        f.write(full_text)
-
-    # Save segments as JSON
-    safe_json_dump({"segments": segments}, f"{out_dir}/transcript_segments.json")
-
-    # Save metadata
     processing_time = time.time() - start_time
-    safe_json_dump(
-        {
-            "timestamp": datetime.utcnow().isoformat(),
-            "language": args.language,
-            "audio_bytes": len(audio_bytes),
-            "audio_file": "audio_original.wav",
-            "transcript_file": "transcript.txt",
-            "processing_time_seconds": processing_time,
-            "processing_time": f"{processing_time:.2f}s",
-        },
-        f"{out_dir}/metadata.json",
-    )
-
-    # Optionally copy to clipboard for Copilot
-    if args.copy_to_clipboard:
+    finished = datetime.now(timezone.utc)
+    ts = now_ts(finished)
+    out_dir = Path(args.output_dir) / f"{ts}_recording"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    audio_size = os.path.getsize(tmp_wav)
+
+    # Optionally copy to clipboard for Copilot; pbcopy/xclip runs alongside the writes
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        clipboard_job = ex.submit(pyperclip.copy, full_text) if args.copy_to_clipboard else None
+        write_files(
+            out_dir,
+            [
+                ("audio_original.wav", lambda path: shutil.move(tmp_wav, path)),
+                ("transcript.txt", full_text),
+                ("transcript_segments.json", {"segments": segments}),
+                (
+                    "metadata.json",
+                    {
+                        "timestamp": finished.isoformat(),
+                        "language": args.language,
+                        "audio_bytes": audio_size,
+                        "audio_file": "audio_original.wav",
+                        "transcript_file": "transcript.txt",
+                        "processing_time_seconds": processing_time,
+                        "processing_time": f"{processing_time:.2f}s",
+                    },
+                ),
+            ],
+        )
+
+    if clipboard_job is not None:
         try:
-            pyperclip.copy(full_text)
+            clipboard_job.result()
             print("\n✓ Transcript copied to clipboard!")
             print("  Paste it in VS Code Copilot chat or code comments.")
         except Exception as e:
             print(f"\nWarning: Could not copy to clipboard: {e}")
 
     print(f"\n✓ Saved to: {out_dir}")
-    print(f"  - audio_original.wav ({len(audio_bytes)} bytes)")
+    print(f"  - audio_original.wav ({audio_size} bytes)")
     print(f"  - transcript.txt")
     print(f"  - transcript_segments.json")
     print(f"  - metadata.json")
@@ -3,15 +3,15 @@
 import argparse
 import sys
 import time
-from datetime import datetime
+from datetime import datetime, timezone
+from pathlib import Path
 
 from dotenv import load_dotenv
 
-from mom_pipeline.live_capture import stream_audio
-from mom_pipeline.live_transcribe import stream_transcription
-from mom_pipeline.postprocess import normalize_segments, segments_to_text
+from mom_pipeline.live_transcribe import transcribe_while_recording
+from mom_pipeline.postprocess import normalize_and_join
 from mom_pipeline.mom_generate import generate_mom, render_markdown
-from mom_pipeline.utils import ensure_dir, now_ts, safe_json_dump
+from mom_pipeline.utils import now_ts, write_files
 
 
 def main():
@@ -31,18 +31,17 @@ def main():
 
     start_time = time.time()
 
+    def print_segment(seg):
+        print(f"[{seg['start']:.1f}s-{seg['end']:.1f}s] {seg['text']}")
+
     try:
-        # Capture audio from mic with preprocessing
-        audio_bytes = stream_audio(duration=None)
+        # Capture audio from mic; each 30 s window is transcribed while recording continues
+        audio_bytes, full_text, segments = transcribe_while_recording(
+            language=args.language, on_segment=print_segment
+        )
     except KeyboardInterrupt:
         print("\nCapture interrupted.")
         return
-
-    print("\nTranscribing with Whisper...")
-    try:
-        full_text, segments = stream_transcription(
-            audio_bytes, language=args.language
-        )
     except Exception as e:
         print(f"Transcription error: {e}")
         return
@@ -53,8 +52,9 @@ def main():
 
     print("\nPost-processing...")
     # Convert segments from Whisper's response_format=verbose_json
-    processed_segments = normalize_segments(segments)
-    cleaned_text = segments_to_text(processed_segments)
+    processed_segments, cleaned_text = normalize_and_join(segments)
+
+    finished = datetime.now(timezone.utc)
 
     print("\nGenerating MoM...")
     participants = [p.strip() for p in args.participants.split(",") if p.strip()] if args.participants else []
@@ -62,39 +62,36 @@ def main():
         transcript_text=cleaned_text,
         metadata={
             "title": args.title,
-            "datetime": datetime.utcnow().isoformat(),
+            "datetime": finished.isoformat(),
             "participants": participants,
         },
     )
     mom_md = render_markdown(mom)
 
     # Save outputs
-    ts = now_ts()
-    out_dir = f"{args.output_dir}/{ts}_live"
-    ensure_dir(out_dir)
-
-    # Save raw audio file
-    with open(f"{out_dir}/audio_original.wav", "wb") as f:
-        f.write(audio_bytes)
-
-    with open(f"{out_dir}/transcript_cleaned.txt", "w") as f:
-        f.write(cleaned_text)
-
-    safe_json_dump({"segments": processed_segments}, f"{out_dir}/transcript_cleaned.json")
-    safe_json_dump(mom, f"{out_dir}/mom.json")
-
-    with open(f"{out_dir}/mom.md", "w") as f:
-        f.write(mom_md)
+    ts = now_ts(finished)
+    out_dir = Path(args.output_dir) / f"{ts}_live"
+    out_dir.mkdir(parents=True, exist_ok=True)
 
     processing_time = time.time() - start_time
-    safe_json_dump(
-        {
-            "audio_bytes": len(audio_bytes),
-            "audio_file": "audio_original.wav",
-            "processing_time_seconds": processing_time,
-            "processing_time": f"{processing_time:.2f}s",
-        },
-        f"{out_dir}/metadata.json",
+    write_files(
+        out_dir,
+        [
+            ("audio_original.wav", audio_bytes),
+            ("transcript_cleaned.txt", cleaned_text),
+            ("transcript_cleaned.json", {"segments": processed_segments}),
+            ("mom.json", mom),
+            ("mom.md", mom_md),
+            (
+                "metadata.json",
+                {
+                    "audio_bytes": len(audio_bytes),
+                    "audio_file": "audio_original.wav",
+                    "processing_time_seconds": processing_time,
+                    "processing_time": f"{processing_time:.2f}s",
+                },
+            ),
+        ],
     )
 
     print(f"\n✓ Outputs saved to: {out_dir}")
@@ -1,20 +1,27 @@
 import argparse
+import functools
 import os
 import time
+from pathlib import Path
 
-from dotenv import load_dotenv
-from mom_pipeline.intake import resolve_source, validate_and_convert, split_if_needed
+from dotenv import find_dotenv, load_dotenv
+from mom_pipeline.intake import resolve_source, convert_and_split
 from mom_pipeline.transcribe import transcribe_files
-from mom_pipeline.postprocess import normalize_segments, segments_to_text
-from mom_pipeline.mom_generate import generate_mom, render_markdown
+from mom_pipeline.postprocess import normalize_and_join
+from mom_pipeline.mom_generate import generate_mom, write_markdown
 from mom_pipeline.utils import (
-    ensure_dir,
-    ffprobe_duration,
     now_ts,
-    safe_json_dump,
     size_to_str,
+    write_files,
 )
 
+# Load .env once at import: the working directory's first, then the one next to
+# this script (or above it) so watcher/launchd runs find it. Neither overrides
+# values already set, so keys missing from the first still come from the second.
+load_dotenv(find_dotenv(usecwd=True))
+_script_env = Path(__file__).resolve().parent / ".env"
+load_dotenv(_script_env if _script_env.exists() else find_dotenv(usecwd=False), override=False)
+
 
 def main():
     parser = argparse.ArgumentParser(description="Google Meet → MoM Pipeline")
@@ -23,22 +30,14 @@ def main():
     parser.add_argument("--datetime", default="", help="Meeting date/time (ISO 8601 if available)")
     parser.add_argument("--participants", default="", help="Comma-separated participant names")
     parser.add_argument("--output-dir", default="outputs", help="Directory to write outputs")
+    parser.add_argument("--language", default="", help="Spoken language code (en, es, ...); auto-detected if omitted")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Regenerate the MoM instead of reusing a cached one (~/.lazy_prompt/cache)",
+    )
     args = parser.parse_args()
 
-    # Load environment variables from .env if present (current dir and script dir)
-    load_dotenv()
-    # Also load .env next to this script so watcher/launchd runs find it
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    from dotenv import find_dotenv
-    local_env = os.path.join(script_dir, ".env")
-    if os.path.exists(local_env):
-        load_dotenv(local_env, override=False)
-    else:
-        # try find_dotenv relative to script_dir
-        found = find_dotenv(filename=".env", usecwd=False)
-        if found:
-            load_dotenv(found, override=False)
-
     api_key = os.getenv("OPENAI_API_KEY", "")
 
     if not api_key:
@@ -48,35 +47,31 @@ def main():
 
     # Prepare working/output dirs
     ts = now_ts()
-    base = os.path.basename(args.source)
-    out_dir = os.path.join(args.output_dir, f"{ts}_{os.path.splitext(base)[0]}")
-    work_dir = os.path.join(out_dir, "work")
-    ensure_dir(out_dir)
-    ensure_dir(work_dir)
+    out_dir = Path(args.output_dir) / f"{ts}_{Path(args.source).stem}"
+    work_dir = out_dir / "work"
+    work_dir.mkdir(parents=True, exist_ok=True)
 
     # Intake
     local_input = resolve_source(args.source, work_dir)
-    audio_path = validate_and_convert(local_input, work_dir)
-    chunks = split_if_needed(audio_path, work_dir)
+    chunks = convert_and_split(local_input, work_dir)
 
     # Transcription
-    raw_text, segments_raw = transcribe_files(chunks)
+    raw_text, segments_raw, duration = transcribe_files(chunks, language=args.language or None)
 
     # Post-processing
-    segments = normalize_segments(segments_raw)
-    cleaned_text = segments_to_text(segments)
+    segments, cleaned_text = normalize_and_join(segments_raw)
 
     # Metadata
-    duration = ffprobe_duration(audio_path) or 0.0
     size_bytes = sum(os.path.getsize(p) for p in chunks)
 
+    processing_time = time.time() - start_time
     meta = {
         "duration_seconds": duration,
         "duration": f"{duration:.2f}s",
         "file_size_bytes": size_bytes,
         "file_size": size_to_str(size_bytes),
-        "processing_time_seconds": time.time() - start_time,
-        "processing_time": f"{time.time() - start_time:.2f}s",
+        "processing_time_seconds": processing_time,
+        "processing_time": f"{processing_time:.2f}s",
     }
 
     # MoM generation
@@ -84,26 +79,24 @@ def main():
     mom = generate_mom(
         transcript_text=cleaned_text,
         metadata={"title": args.title, "datetime": args.datetime, "participants": participants},
+        use_cache=not args.no_cache,
     )
-    mom_md = render_markdown(mom)
 
     # Outputs
-    with open(os.path.join(out_dir, "transcript_cleaned.txt"), "w", encoding="utf-8") as f:
-        f.write(cleaned_text)
-
-    safe_json_dump({"segments": segments}, os.path.join(out_dir, "transcript_cleaned.json"))
-    safe_json_dump(mom, os.path.join(out_dir, "mom.json"))
-    safe_json_dump(meta, os.path.join(out_dir, "metadata.json"))
-
-    with open(os.path.join(out_dir, "mom.md"), "w", encoding="utf-8") as f:
-        f.write(mom_md)
+    write_files(
+        out_dir,
+        [
+            ("transcript_cleaned.txt", cleaned_text),
+            ("transcript_cleaned.json", {"segments": segments}),
+            ("mom.json", mom),
+            ("metadata.json", meta),
+            ("mom.md", functools.partial(write_markdown, mom)),
+        ],
+    )
 
     print("\nCompleted. Outputs:")
-    print(f"- {os.path.join(out_dir, 'transcript_cleaned.txt')}")
-    print(f"- {os.path.join(out_dir, 'transcript_cleaned.json')}")
-    print(f"- {os.path.join(out_dir, 'mom.json')}")
-    print(f"- {os.path.join(out_dir, 'mom.md')}")
-    print(f"- {os.path.join(out_dir, 'metadata.json')}")
+    for name in ("transcript_cleaned.txt", "transcript_cleaned.json", "mom.json", "mom.md", "metadata.json"):
+        print(f"- {out_dir / name}")
 
 
 if __name__ == "__main__":
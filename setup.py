@@ -7,7 +7,7 @@ OPTIONS = {
     "argv_emulation": True,
     # Explicit includes help py2app collect Tkinter and deps when not in alias mode.
     "includes": ["tkinter"],
-    "packages": ["src", "pyperclip", "sounddevice", "numpy", "scipy", "openai", "ffmpeg"],
+    "packages": ["src", "pyperclip", "sounddevice", "numpy", "scipy", "openai", "orjson", "ffmpeg"],
     "plist": {
         "CFBundleName": "VoiceToTranscript",
         "CFBundleDisplayName": "VoiceToTranscript",
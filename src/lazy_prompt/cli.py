@@ -10,23 +10,27 @@ Environment:
 import argparse
 import os
 import sys
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import Future
+from datetime import datetime, timezone
 from pathlib import Path
 
-from dotenv import load_dotenv
-import pyperclip
-from openai import OpenAI
+from mom_pipeline.cache import get_cache, make_key
+from mom_pipeline.utils import ensure_dir, now_ts, write_files
 
-try:
-    import keyring
-except Exception:
-    keyring = None
+# openai, sounddevice/scipy, keyring, pyperclip and dotenv are imported where
+# they are used so `lazy-prompt --help` does not pay for them.
 
-from mom_pipeline.live_capture import stream_audio, stream_audio_auto_stop
-from mom_pipeline.live_transcribe import transcribe_audio, translate_audio
-from mom_pipeline.utils import ensure_dir, now_ts, safe_json_dump
-from lazy_prompt.interactive import interactive_refinement_flow
+DEFAULT_ENHANCE_MODEL = "gpt-4o-mini"
+
+
+def _keyring():
+    try:
+        import keyring
+    except Exception:
+        return None
+    return keyring
 
 
 def _get_api_key(arg_key: str | None) -> str | None:
@@ -35,6 +39,7 @@ def _get_api_key(arg_key: str | None) -> str | None:
     env_key = os.getenv("OPENAI_API_KEY")
     if env_key:
         return env_key
+    keyring = _keyring()
     if keyring:
         try:
             return keyring.get_password("lazy-prompt", "OPENAI_API_KEY")
@@ -44,7 +49,8 @@ def _get_api_key(arg_key: str | None) -> str | None:
 
 
 def _persist_api_key(api_key: str | None) -> None:
-    if not api_key or not keyring:
+    keyring = _keyring() if api_key else None
+    if not keyring:
         return
     try:
         keyring.set_password("lazy-prompt", "OPENAI_API_KEY", api_key)
@@ -52,12 +58,64 @@ def _persist_api_key(api_key: str | None) -> None:
         pass
 
 
-def _enhance_prompt(raw_text: str) -> str:
-    """Use GPT-4 to enhance the user's spoken prompt with expert prompt engineering."""
-    client = OpenAI()
+def _copy_in_background(text: str) -> Future:
+    """Copy text on a daemon thread; the returned future re-raises any clipboard error."""
+    done: Future = Future()
+
+    def run():
+        try:
+            import pyperclip
+
+            pyperclip.copy(text)
+            done.set_result(None)
+        except Exception as exc:  # noqa: BLE001
+            done.set_exception(exc)
+
+    threading.Thread(target=run, daemon=True).start()
+    return done
+
+
+def _transcribe(audio_bytes: bytes, language: str, translate_to_english: bool, use_cache: bool):
+    """Transcribe or translate audio, reusing a cached result for identical audio."""
+    from mom_pipeline.live_transcribe import transcribe_audio, translate_audio
+    from mom_pipeline.local_whisper import backend_id
+
+    cache = get_cache() if use_cache else None
+    key = make_key(audio_bytes, "transcribe", language, translate_to_english, backend_id())
+    if cache is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            print("(Using cached transcript)")
+            return tuple(hit)
+
+    if translate_to_english:
+        full_text, segments = translate_audio(audio_bytes, source_language=language)
+    else:
+        full_text, segments = transcribe_audio(audio_bytes, language=language)
+
+    if cache is not None and full_text.strip():
+        cache.set(key, [full_text, segments])
+    return full_text, segments
+
+
+def _enhance_prompt(raw_text: str, use_cache: bool = True, model: str = DEFAULT_ENHANCE_MODEL) -> str:
+    """Use a chat model to enhance the user's spoken prompt with expert prompt engineering.
+
+    Tokens are streamed to stdout as they arrive; the full text is returned.
+    """
+    from mom_pipeline.openai_client import get_client
+
+    cache = get_cache() if use_cache else None
+    key = make_key(raw_text, "enhance", model)
+    if cache is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            print(hit)
+            return hit
+
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
+        stream = get_client().chat.completions.create(
+            model=model,
             messages=[
                 {
                     "role": "system",
@@ -75,8 +133,20 @@ def _enhance_prompt(raw_text: str) -> str:
                 {"role": "user", "content": raw_text},
             ],
             temperature=0.7,
+            stream=True,
         )
-        return response.choices[0].message.content.strip()
+        pieces = []
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            piece = chunk.choices[0].delta.content or ""
+            pieces.append(piece)
+            print(piece, end="", flush=True)
+        print()
+        enhanced = "".join(pieces).strip()
+        if cache is not None:
+            cache.set(key, enhanced)
+        return enhanced
     except Exception as e:
         print(f"\nWarning: Prompt enhancement failed: {e}")
         return raw_text
@@ -91,18 +161,32 @@ def run_once(
     api_key: str | None,
     enhance_prompt: bool,
     interactive_mode: bool,
+    use_cache: bool = True,
+    enhance_model: str = DEFAULT_ENHANCE_MODEL,
 ) -> int:
-    load_dotenv()
+    from dotenv import load_dotenv
+
+    from lazy_prompt.interactive import interactive_refinement_flow
+    from mom_pipeline.live_capture import stream_audio, stream_audio_auto_stop
+    from mom_pipeline.local_whisper import local_backend_enabled, start_warmup
+    from mom_pipeline.openai_client import prewarm
 
+    load_dotenv()
     key = _get_api_key(api_key)
     if not key:
         print("Missing OPENAI_API_KEY. Pass --api-key once or set env/Keychain.")
         return 1
     os.environ["OPENAI_API_KEY"] = key
     _persist_api_key(api_key)
+    # Build the shared API client and open its connection while the user speaks
+    prewarm(key)
 
     print("\n=== lazy_prompt: Voice → Transcript ===")
     print(f"Language: {language}")
+
+    if local_backend_enabled():
+        # Model load and kernel warm-up overlap the recording
+        start_warmup()
     
     # For interactive mode, auto-start voice capture (hands-free)
     if interactive_mode:
@@ -117,10 +201,7 @@ def run_once(
 
         print("\nTranscribing with Whisper...")
         try:
-            if translate_to_english:
-                full_text, segments = translate_audio(audio_bytes, source_language=language)
-            else:
-                full_text, segments = transcribe_audio(audio_bytes, language=language)
+            full_text, segments = _transcribe(audio_bytes, language, translate_to_english, use_cache)
         except Exception as exc:  # noqa: BLE001
             print(f"Transcription error: {exc}")
             return 1
@@ -135,10 +216,7 @@ def run_once(
 
         print("\nTranscribing with Whisper...")
         try:
-            if translate_to_english:
-                full_text, segments = translate_audio(audio_bytes, source_language=language)
-            else:
-                full_text, segments = transcribe_audio(audio_bytes, language=language)
+            full_text, segments = _transcribe(audio_bytes, language, translate_to_english, use_cache)
         except Exception as exc:  # noqa: BLE001
             print(f"Transcription error: {exc}")
             return 1
@@ -149,52 +227,54 @@ def run_once(
     # Interactive refinement mode
     if interactive_mode:
         print("\nStarting interactive refinement...")
-        final_text = interactive_refinement_flow(full_text, language=language, api_key=key)
+        final_text = interactive_refinement_flow(full_text, language=language, api_key=key, use_cache=use_cache)
     elif enhance_prompt:
         # Standard enhancement without interaction
-        print("\nEnhancing prompt with GPT-4...")
-        enhanced_text = _enhance_prompt(full_text)
+        print(f"\nEnhancing prompt with {enhance_model}...")
         print("\n=== Enhanced Prompt ===")
-        print(enhanced_text)
+        enhanced_text = _enhance_prompt(full_text, use_cache=use_cache, model=enhance_model)
         print("======================\n")
         final_text = enhanced_text
     else:
         final_text = full_text
 
+    clipboard_job = None
+    if copy_to_clipboard:
+        # pyperclip shells out (pbcopy/xclip); let it run while files are written
+        clipboard_job = _copy_in_background(final_text)
+
     if save_outputs:
-        ts = now_ts()
+        processing_time = time.time() - start_time
+        finished = datetime.now(timezone.utc)
+        ts = now_ts(finished)
         out_dir = output_dir / f"{ts}_recording"
         ensure_dir(out_dir)
 
-        # Save raw audio file
-        (out_dir / "audio_original.wav").write_bytes(audio_bytes)
-
-        # Save transcript
-        (out_dir / "transcript.txt").write_text(full_text)
+        files = [
+            ("audio_original.wav", audio_bytes),
+            ("transcript.txt", full_text),
+            ("transcript_segments.json", {"segments": segments}),
+            (
+                "metadata.json",
+                {
+                    "timestamp": finished.isoformat(),
+                    "language": language,
+                    "audio_bytes": len(audio_bytes),
+                    "audio_file": "audio_original.wav",
+                    "transcript_file": "transcript.txt",
+                    "processing_time_seconds": processing_time,
+                    "processing_time": f"{processing_time:.2f}s",
+                },
+            ),
+        ]
         if enhance_prompt or interactive_mode:
-            (out_dir / "enhanced_prompt.txt").write_text(final_text)
+            files.append(("enhanced_prompt.txt", final_text))
+        # Written in parallel, overlapping the clipboard copy started above
+        write_files(out_dir, files)
 
-        # Save segments as JSON
-        safe_json_dump({"segments": segments}, out_dir / "transcript_segments.json")
-
-        # Save metadata
-        processing_time = time.time() - start_time
-        safe_json_dump(
-            {
-                "timestamp": datetime.utcnow().isoformat(),
-                "language": language,
-                "audio_bytes": len(audio_bytes),
-                "audio_file": "audio_original.wav",
-                "transcript_file": "transcript.txt",
-                "processing_time_seconds": processing_time,
-                "processing_time": f"{processing_time:.2f}s",
-            },
-            out_dir / "metadata.json",
-        )
-
-    if copy_to_clipboard:
+    if clipboard_job is not None:
         try:
-            pyperclip.copy(final_text)
+            clipboard_job.result()
             mode_desc = "Refined prompt" if interactive_mode else ("Enhanced prompt" if enhance_prompt else "Transcript")
             print(f"\n✓ {mode_desc} copied to clipboard.")
         except Exception as exc:  # noqa: BLE001
@@ -247,13 +327,23 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument(
         "--enhance-prompt",
         action="store_true",
-        help="Use GPT-4 to enhance the transcript into an expert-level, structured prompt",
+        help="Use a chat model (see --enhance-model) to enhance the transcript into an expert-level, structured prompt",
+    )
+    parser.add_argument(
+        "--enhance-model",
+        default=DEFAULT_ENHANCE_MODEL,
+        help=f"Chat model used by --enhance-prompt (default: {DEFAULT_ENHANCE_MODEL})",
     )
     parser.add_argument(
         "--interactive",
         action="store_true",
         help="Enable interactive mode: AI asks clarifying questions to refine your prompt through dialogue",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk transcript/enhancement cache (~/.lazy_prompt/cache)",
+    )
 
     args = parser.parse_args(argv)
     return run_once(
@@ -265,6 +355,8 @@ def main(argv: list[str] | None = None) -> int:
         api_key=args.api_key,
         enhance_prompt=args.enhance_prompt,
         interactive_mode=args.interactive,
+        use_cache=not args.no_cache,
+        enhance_model=args.enhance_model,
     )
 
 
@@ -6,30 +6,110 @@ comprehensive refined prompt based on the entire conversation.
 """
 
 from typing import Optional
+import re
+import select
 import shutil
 import subprocess
-from openai import OpenAI
+import sys
 
-from mom_pipeline.live_capture import stream_audio_auto_stop
+from mom_pipeline.live_capture import stream_audio_incremental
 from mom_pipeline.live_transcribe import transcribe_audio
+from mom_pipeline.local_whisper import local_backend_enabled, start_warmup
+from mom_pipeline.openai_client import get_client, prewarm
 
+from lazy_prompt.semantic_cache import cached_chat_completion
 
-def _speak_text(text: str) -> None:
-    """Speak text aloud using macOS `say` if available; otherwise, no-op.
+# Once the per-turn context grows past this many messages, everything between
+# the system prompt and the most recent HISTORY_KEEP_MESSAGES is summarized.
+HISTORY_SUMMARIZE_AFTER = 8
+HISTORY_KEEP_MESSAGES = 6
+SUMMARY_MODEL = "gpt-4o-mini"
 
+# Optional wake phrase at the start of the first utterance, e.g. "Hey Jarvis, ..."
+_WAKE_RE = re.compile(r"^\s*hey\s+jarvis[\s,!.:-]*", re.IGNORECASE)
+# Whole-word phrases that end the dialogue ("already" must not match "ready")
+_DONE_RE = re.compile(
+    r"\b(done|finished|complete|ready|that['’]?s (it|all)|sleep,?\s*jarvis)\b", re.IGNORECASE
+)
+
+
+def _speak_text(text: str) -> Optional[subprocess.Popen]:
+    """Start speaking text aloud using macOS `say` if available; otherwise, no-op.
+
+    Returns immediately with the `say` process (or None) so the caller can
+    carry on while the question is read out; see _wait_for_speech.
     Keeps dependencies minimal while enabling conversational audio playback for AI questions.
     """
     say_cmd = shutil.which("say")
     if not say_cmd or not text.strip():
-        return
+        return None
     try:
-        subprocess.run([say_cmd, text], check=False)
+        return subprocess.Popen([say_cmd, text])
     except Exception:
         # Fail silently to avoid interrupting the flow if TTS is unavailable.
-        pass
+        return None
+
+
+def _compact_history(client, messages: list[dict]) -> list[dict]:
+    """Bound the context sent each turn: system prompt, a summary of older turns,
+    and the last HISTORY_KEEP_MESSAGES messages verbatim.
+
+    Returns `messages` unchanged when it is still short or summarizing fails.
+    """
+    if len(messages) <= HISTORY_SUMMARIZE_AFTER:
+        return messages
+    older = messages[1:-HISTORY_KEEP_MESSAGES]
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in older)
+    try:
+        response = client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        "Summarize this requirements conversation in a few concise bullet points. "
+                        "Keep every concrete requirement, constraint, preference and decision."
+                    ),
+                },
+                {"role": "user", "content": transcript},
+            ],
+            temperature=0,
+        )
+        summary = response.choices[0].message.content
+    except Exception:
+        return messages
+    return [
+        messages[0],
+        {"role": "system", "content": f"Conversation so far: {summary}"},
+    ] + messages[-HISTORY_KEEP_MESSAGES:]
+
 
+def _wait_for_speech(proc: Optional[subprocess.Popen]) -> None:
+    """Let a spoken question finish before the mic opens, or cut it short on Enter.
 
-def interactive_dialogue_session(initial_prompt: str, language: str = "en", api_key: Optional[str] = None) -> tuple[list[dict], str]:
+    Recording only starts once `say` has stopped, since the mic would
+    otherwise transcribe the AI's own voice.
+    """
+    if proc is None or proc.poll() is not None:
+        return
+    if not sys.stdin.isatty():
+        proc.wait()
+        return
+    print("(Press Enter to skip the voice and answer right away)")
+    try:
+        while proc.poll() is None:
+            if select.select([sys.stdin], [], [], 0.1)[0]:
+                sys.stdin.readline()
+                proc.terminate()
+                break
+    except KeyboardInterrupt:
+        proc.terminate()
+        raise
+
+
+def interactive_dialogue_session(
+    initial_prompt: str, language: str = "en", api_key: Optional[str] = None, use_cache: bool = True
+) -> tuple[list[dict], str]:
     """Run an interactive dialogue with AI asking follow-up questions.
     
     User speaks initial idea → Whisper transcribes → LLM asks clarifying questions
@@ -40,19 +120,18 @@ def interactive_dialogue_session(initial_prompt: str, language: str = "en", api_
         initial_prompt: The user's initial spoken prompt.
         language: Language for voice transcription.
         api_key: OpenAI API key for transcription and LLM.
+        use_cache: Answer paraphrased turns from the semantic cache when possible.
         
     Returns:
         Tuple of (conversation_history, combined_transcript) where conversation_history
         is the full chat history and combined_transcript is all user inputs combined.
     """
-    client = OpenAI(api_key=api_key) if api_key else OpenAI()
+    client = get_client(api_key)
     
     # Remove optional wake phrase "Hey Jarvis" to keep prompts clean
     stripped_initial = initial_prompt
-    low = initial_prompt.lower().strip()
-    if low.startswith("hey jarvis"):
-        stripped_initial = initial_prompt[len(initial_prompt.split(" ", 2)[0]) + len(initial_prompt.split(" ", 2)[1]) + 2 :] if len(initial_prompt.split()) > 2 else ""
-        stripped_initial = stripped_initial.strip() or "(no content after wake phrase)"
+    if _WAKE_RE.match(initial_prompt):
+        stripped_initial = _WAKE_RE.sub("", initial_prompt, count=1).strip() or "(no content after wake phrase)"
 
     print("\n" + "="*70)
     print("🎯 Interactive Dialogue Session")
@@ -81,16 +160,13 @@ Ask in plain sentences, friendly and concise, not formal checklists."""},
     
     # Get initial questions from LLM
     print("🤖 AI: Let me ask some clarifying questions...\n")
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=conversation_history,
-        temperature=0.7,
-    )
-    
-    ai_questions = response.choices[0].message.content
+    ai_questions = cached_chat_completion(client, conversation_history, use_cache=use_cache)
     conversation_history.append({"role": "assistant", "content": ai_questions})
+    # What each turn actually sends; older turns get folded into a summary,
+    # while conversation_history keeps everything for the final prompt
+    context = list(conversation_history)
     print(f"{ai_questions}\n")
-    _speak_text(ai_questions)
+    speaking = _speak_text(ai_questions)
     
     # Conversation loop
     turn_number = 1
@@ -100,13 +176,18 @@ Ask in plain sentences, friendly and concise, not formal checklists."""},
         print(f"\n{'='*70}")
         print(f"Turn {turn_number}: Your turn to speak")
         print("="*70)
-        print(f"🎤 Recording... (Say 'DONE' when finished, or press Ctrl+C to stop)\n")
         
         try:
-            # Capture user's spoken answer
-            audio_bytes = stream_audio_auto_stop()
-            print("\n📝 Transcribing...\n")
-            user_text, _ = transcribe_audio(audio_bytes, language=language)
+            _wait_for_speech(speaking)
+            print(f"🎤 Recording... (Say 'DONE' when finished, or press Ctrl+C to stop)\n")
+
+            # Capture the spoken answer, transcribing confirmed words as they come
+            user_text = stream_audio_incremental(
+                lambda audio: transcribe_audio(audio, language=language),
+                on_partial=lambda words: print(words, end=" ", flush=True),
+                vad_aggressiveness=2,
+            )
+            print()
             
             if not user_text.strip():
                 print("❌ No speech detected. Please try again.\n")
@@ -118,27 +199,22 @@ Ask in plain sentences, friendly and concise, not formal checklists."""},
             all_user_inputs.append(user_text)
             
             # Check if user said DONE
-            user_lower = user_text.lower().strip()
-            if any(word in user_lower for word in ["done", "that's it", "that's all", "finished", "complete", "ready", "sleep jarvis", "sleep, jarvis"]):
+            if _DONE_RE.search(user_text):
                 print("\n✓ Got it! Generating your detailed prompt...\n")
                 conversation_history.append({"role": "user", "content": user_text})
                 break
             
             # Add user response to conversation
             conversation_history.append({"role": "user", "content": user_text})
+            context = _compact_history(client, context + [conversation_history[-1]])
             
             # Get next set of questions from LLM
             print("🤖 AI: Processing your answer...\n")
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=conversation_history,
-                temperature=0.7,
-            )
-            
-            ai_response = response.choices[0].message.content
+            ai_response = cached_chat_completion(client, context, use_cache=use_cache)
             conversation_history.append({"role": "assistant", "content": ai_response})
+            context.append(conversation_history[-1])
             print(f"{ai_response}\n")
-            _speak_text(ai_response)
+            speaking = _speak_text(ai_response)
             
             turn_number += 1
             
@@ -152,7 +228,9 @@ Ask in plain sentences, friendly and concise, not formal checklists."""},
     return conversation_history, combined_transcript
 
 
-def generate_refined_prompt(conversation_history: list[dict], combined_transcript: str, api_key: Optional[str] = None) -> str:
+def generate_refined_prompt(
+    conversation_history: list[dict], combined_transcript: str, api_key: Optional[str] = None, use_cache: bool = True
+) -> str:
     """Generate a detailed refined prompt based on the entire conversation.
     
     The LLM uses the full dialogue history to create a comprehensive, structured prompt
@@ -162,11 +240,12 @@ def generate_refined_prompt(conversation_history: list[dict], combined_transcrip
         conversation_history: The full chat history between user and AI.
         combined_transcript: All user inputs combined into one string.
         api_key: OpenAI API key.
+        use_cache: Reuse semantically equivalent answers from earlier sessions.
         
     Returns:
         The final refined prompt.
     """
-    client = OpenAI(api_key=api_key) if api_key else OpenAI()
+    client = get_client(api_key)
     
     print("="*70)
     print("🧠 Generating Your Refined Prompt")
@@ -208,33 +287,37 @@ and sectioned for quick execution."""}]
     )
     
     # Call GPT-4o for refinement
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=final_messages,
-        temperature=0.7,
-    )
-    
-    refined_prompt = response.choices[0].message.content
+    refined_prompt = cached_chat_completion(client, final_messages, use_cache=use_cache)
     
     return refined_prompt
 
 
-def interactive_refinement_flow(initial_prompt: str, language: str = "en", api_key: Optional[str] = None) -> str:
+def interactive_refinement_flow(
+    initial_prompt: str, language: str = "en", api_key: Optional[str] = None, use_cache: bool = True
+) -> str:
     """Run the full interactive dialogue and refinement flow.
     
     Args:
         initial_prompt: The user's initial spoken prompt (used as starting context).
         language: Language for voice transcription.
         api_key: OpenAI API key.
+        use_cache: Reuse semantically equivalent answers from earlier sessions.
         
     Returns:
         The final refined prompt.
     """
+    # Connection and (local) model warm-up overlap the banner and first LLM call;
+    # both run once per process, so this is free when run_once already started them
+    prewarm(api_key)
+    if local_backend_enabled():
+        start_warmup()
+
     # Run interactive dialogue
     conversation_history, combined_transcript = interactive_dialogue_session(
         initial_prompt, 
         language=language, 
-        api_key=api_key
+        api_key=api_key,
+        use_cache=use_cache,
     )
     
     if not combined_transcript:
@@ -245,7 +328,8 @@ def interactive_refinement_flow(initial_prompt: str, language: str = "en", api_k
     refined_prompt = generate_refined_prompt(
         conversation_history,
         combined_transcript,
-        api_key=api_key
+        api_key=api_key,
+        use_cache=use_cache,
     )
     
     return refined_prompt
@@ -0,0 +1,146 @@
+"""Semantic cache for interactive chat turns.
+
+A turn is answered from the cache when the new user message means the same
+thing as one seen before (cosine similarity of text-embedding-3-small vectors
+at or above the threshold) *and* it arrives in the same context: same model
+and the same conversation up to that message. The context check keeps a
+paraphrased "make it shorter" from being answered with a reply written for a
+different conversation, and keeps the fixed final refinement instruction from
+matching across sessions. Backed by SQLite next to the result cache, so hits
+survive process restarts.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from mom_pipeline.cache import DEFAULT_CACHE_DIR
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+DEFAULT_THRESHOLD = 0.92
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def context_digest(model: str, messages: List[dict]) -> str:
+    """Digest of the model and every message before the last one (the context chain)."""
+    h = hashlib.sha256(model.encode("utf-8"))
+    for m in messages[:-1]:
+        h.update(f"\0{m['role']}\0".encode("utf-8"))
+        h.update(m["content"].encode("utf-8"))
+    return h.hexdigest()
+
+
+class SemanticCache:
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.directory = Path(directory or os.getenv("LAZY_PROMPT_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.directory / "semantic.db"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS turns ("
+            "id INTEGER PRIMARY KEY, context TEXT NOT NULL, embedding BLOB NOT NULL, "
+            "response TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS turns_context ON turns (context)")
+        self._conn.commit()
+
+    def lookup(self, context: str, embedding: np.ndarray) -> Optional[str]:
+        """Return the stored response closest to `embedding` in `context`, if similar enough."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT embedding, response FROM turns WHERE context = ?", (context,)
+            ).fetchall()
+        if not rows:
+            return None
+        matrix = np.stack([np.frombuffer(blob, dtype=np.float32) for blob, _ in rows])
+        scores = matrix @ _unit(embedding)
+        best = int(np.argmax(scores))
+        return rows[best][1] if scores[best] >= self.threshold else None
+
+    def store(self, context: str, embedding: np.ndarray, response: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO turns (context, embedding, response, created) VALUES (?, ?, ?, ?)",
+                (context, _unit(embedding).tobytes(), response, time.time()),
+            )
+            self._conn.execute(
+                "DELETE FROM turns WHERE id NOT IN (SELECT id FROM turns ORDER BY created DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+
+def _unit(vector) -> np.ndarray:
+    """float32 copy scaled to unit length, so a dot product is the cosine similarity."""
+    v = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(v))
+    return v / norm if norm else v
+
+
+_CACHE: Optional[SemanticCache] = None
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """Return the shared semantic cache, or None if it cannot be opened."""
+    global _CACHE
+    if _CACHE is None:
+        try:
+            _CACHE = SemanticCache()
+        except Exception as e:
+            print(f"Warning: semantic cache disabled: {e}")
+            return None
+    return _CACHE
+
+
+def cached_chat_completion(
+    client,
+    messages: List[dict],
+    model: str = "gpt-4o",
+    temperature: float = 0.7,
+    use_cache: bool = True,
+) -> str:
+    """Chat completion that reuses a stored answer for a paraphrased last user turn.
+
+    On a miss (or when the cache or embeddings call is unavailable) this is a
+    plain chat.completions call; the answer is then stored for next time.
+    """
+    cache = get_semantic_cache() if use_cache else None
+    context = embedding = None
+    if cache is not None and messages and messages[-1]["role"] == "user":
+        try:
+            context = context_digest(model, messages)
+            embedding = np.asarray(
+                client.embeddings.create(model=EMBEDDING_MODEL, input=messages[-1]["content"]).data[0].embedding,
+                dtype=np.float32,
+            )
+            hit = cache.lookup(context, embedding)
+            if hit is not None:
+                return hit
+        except Exception:
+            embedding = None
+
+    response = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+    )
+    content = response.choices[0].message.content
+
+    if embedding is not None and content:
+        try:
+            cache.store(context, embedding, content)
+        except Exception:
+            pass
+    return content
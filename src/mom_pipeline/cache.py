@@ -0,0 +1,86 @@
+"""On-disk LRU cache for transcription and prompt-enhancement results.
+
+Entries are keyed by a SHA-256 digest of the input (audio bytes or text) plus
+the options that affect the output, so re-running on the same clip skips the
+API call entirely. Backed by SQLite; least recently used rows are evicted once
+the total stored size exceeds the cap.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+
+DEFAULT_CACHE_DIR = Path.home() / ".lazy_prompt" / "cache"
+DEFAULT_SIZE_LIMIT = 2 * 1024 * 1024 * 1024  # 2 GB
+
+
+def make_key(data, *parts) -> str:
+    """SHA-256 of `data` (str or any bytes-like buffer) followed by any extra key parts."""
+    h = hashlib.sha256(data.encode("utf-8") if isinstance(data, str) else data)
+    for p in parts:
+        h.update(b"\0")
+        h.update(str(p).encode("utf-8"))
+    return h.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory: Optional[Path] = None, size_limit: int = DEFAULT_SIZE_LIMIT):
+        self.directory = Path(directory or os.getenv("LAZY_PROMPT_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.size_limit = size_limit
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.directory / "cache.db"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, payload, len(payload), time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.size_limit:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.size_limit:
+                break
+
+
+_CACHE: Optional[ResultCache] = None
+
+
+def get_cache() -> Optional[ResultCache]:
+    """Return the shared cache, or None if it cannot be opened."""
+    global _CACHE
+    if _CACHE is None:
+        try:
+            _CACHE = ResultCache()
+        except Exception as e:
+            print(f"Warning: cache disabled: {e}")
+            return None
+    return _CACHE
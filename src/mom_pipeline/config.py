@@ -16,3 +16,8 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 if not OPENAI_API_KEY:
     # We do not raise here; CLI will surface a friendly error.
     pass
+
+# Transcription backend: "openai" (Whisper API) or "local" (faster-whisper).
+# Read at call time via os.getenv so values from .env are honoured.
+DEFAULT_WHISPER_BACKEND = "openai"
+LOCAL_WHISPER_MODEL = "small"
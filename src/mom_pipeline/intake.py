@@ -12,26 +12,29 @@ from .config import (
     DEFAULT_CHANNELS,
     DEFAULT_SAMPLE_RATE,
     DEFAULT_SEGMENT_SECONDS,
-    WHISPER_MAX_BYTES,
 )
 from .utils import ensure_dir, ffmpeg_available, ffprobe_duration, run_cmd
 
 
+# Large enough that a multi-GB recording downloads in a few hundred writes
+_COPY_BUFSIZE = 8 * 1024 * 1024
+
+
 def _ext(path: str) -> str:
-    return os.path.splitext(path.lower())[1]
+    i = path.rfind(".")
+    if i <= max(path.rfind("/"), path.rfind(os.sep)) + 1:
+        return ""
+    return path[i:].lower()
 
 
 def _is_url(s: str) -> bool:
-    try:
-        p = urlparse(s)
-        return p.scheme in {"http", "https"}
-    except Exception:
-        return False
+    return s[:8].lower().startswith(("http://", "https://"))
 
 
 def resolve_source(source: str, work_dir: str) -> str:
     """Return a local file path; download if URL.
-    Copies local source to work_dir for consistent processing.
+    Places local source in work_dir for consistent processing: hard-linked
+    when it is on the same filesystem, otherwise copied.
     """
     ensure_dir(work_dir)
     if _is_url(source):
@@ -39,84 +42,49 @@ def resolve_source(source: str, work_dir: str) -> str:
         local_path = os.path.join(work_dir, fn)
         with requests.get(source, stream=True, timeout=60) as r:
             r.raise_for_status()
+            # Let urllib3 undo any Content-Encoding so the file on disk is the media itself
+            r.raw.decode_content = True
             with open(local_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=1024 * 1024):
-                    if chunk:
-                        f.write(chunk)
+                shutil.copyfileobj(r.raw, f, length=_COPY_BUFSIZE)
         return local_path
     else:
         if not os.path.exists(source):
             raise FileNotFoundError(f"Source not found: {source}")
         target = os.path.join(work_dir, os.path.basename(source))
-        shutil.copy2(source, target)
+        try:
+            os.link(source, target)
+        except OSError:
+            # Different filesystem (or no hard links): copy2 uses sendfile on
+            # Linux and fcopyfile on macOS, so the data stays in the kernel
+            shutil.copy2(source, target)
         return target
 
 
-def validate_and_convert(input_path: str, work_dir: str) -> str:
-    """Validate type; if video, convert to MP3 16k mono; if audio, re-encode to target profile.
-    Returns path to audio file ready for Whisper.
+def convert_and_split(input_path: str, work_dir: str) -> list:
+    """Validate type, then decode, re-encode to the 16k mono MP3 profile and
+    split into DEFAULT_SEGMENT_SECONDS parts in a single ffmpeg pass.
+
+    At DEFAULT_BITRATE (64 kbps) a 900 s part is about 7 MB, well under the
+    Whisper upload limit, so no part ever needs a second encode.
+    Returns the part paths in order (a single element for short inputs).
     """
     if not ffmpeg_available():
         raise RuntimeError("ffmpeg/ffprobe not available. Install via `brew install ffmpeg`.")
 
     ext = _ext(input_path)
-    audio_out = os.path.join(work_dir, "audio_normalized.mp3")
-
-    if ext in ALLOWED_VIDEO_EXTS:
-        cmd = (
-            f"ffmpeg -y -i \"{input_path}\" -vn -ac {DEFAULT_CHANNELS} "
-            f"-ar {DEFAULT_SAMPLE_RATE} -b:a {DEFAULT_BITRATE} \"{audio_out}\""
-        )
-        proc = run_cmd(cmd)
-        if proc.returncode != 0:
-            raise RuntimeError(f"ffmpeg video→audio failed: {proc.stderr}")
-        return audio_out
-    elif ext in ALLOWED_AUDIO_EXTS:
-        cmd = (
-            f"ffmpeg -y -i \"{input_path}\" -ac {DEFAULT_CHANNELS} "
-            f"-ar {DEFAULT_SAMPLE_RATE} -b:a {DEFAULT_BITRATE} \"{audio_out}\""
-        )
-        proc = run_cmd(cmd)
-        if proc.returncode != 0:
-            raise RuntimeError(f"ffmpeg audio re-encode failed: {proc.stderr}")
-        return audio_out
-    else:
+    if ext not in ALLOWED_VIDEO_EXTS and ext not in ALLOWED_AUDIO_EXTS:
         raise ValueError(f"Unsupported file type: {ext}")
 
-
-def split_if_needed(audio_path: str, work_dir: str) -> list:
-    """Split audio into segments if it exceeds Whisper upload limits.
-    Returns list of segment file paths (or single-element list).
-    """
-    size = os.path.getsize(audio_path)
-    if size <= WHISPER_MAX_BYTES:
-        return [audio_path]
-
-    # Segment into DEFAULT_SEGMENT_SECONDS chunks
     seg_dir = os.path.join(work_dir, "segments")
     ensure_dir(seg_dir)
     segment_template = os.path.join(seg_dir, "part_%03d.mp3")
-    cmd = (
-        f"ffmpeg -y -i \"{audio_path}\" -f segment -segment_time {DEFAULT_SEGMENT_SECONDS} "
-        f"-c copy \"{segment_template}\""
-    )
+    cmd = [
+        "ffmpeg", "-y", "-i", str(input_path), "-vn",
+        "-ac", str(DEFAULT_CHANNELS), "-ar", str(DEFAULT_SAMPLE_RATE), "-b:a", DEFAULT_BITRATE,
+        "-f", "segment", "-segment_time", str(DEFAULT_SEGMENT_SECONDS), "-reset_timestamps", "1",
+        segment_template,
+    ]
     proc = run_cmd(cmd)
     if proc.returncode != 0:
-        raise RuntimeError(f"ffmpeg segmenting failed: {proc.stderr}")
-    parts = sorted([os.path.join(seg_dir, f) for f in os.listdir(seg_dir) if f.startswith("part_")])
-
-    # As a safeguard, re-encode overly large chunks
-    adjusted = []
-    for p in parts:
-        if os.path.getsize(p) > WHISPER_MAX_BYTES:
-            tmp = os.path.join(seg_dir, f"re_{os.path.basename(p)}")
-            cmd2 = (
-                f"ffmpeg -y -i \"{p}\" -ac {DEFAULT_CHANNELS} -ar {DEFAULT_SAMPLE_RATE} -b:a {DEFAULT_BITRATE} \"{tmp}\""
-            )
-            proc2 = run_cmd(cmd2)
-            if proc2.returncode != 0:
-                raise RuntimeError(f"ffmpeg re-encode segment failed: {proc2.stderr}")
-            adjusted.append(tmp)
-        else:
-            adjusted.append(p)
-    return adjusted
+        raise RuntimeError(f"ffmpeg convert/segment failed: {proc.stderr}")
+    return sorted(os.path.join(seg_dir, f) for f in os.listdir(seg_dir) if f.startswith("part_"))
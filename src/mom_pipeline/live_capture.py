@@ -1,14 +1,32 @@
 """Live microphone capture and streaming to Whisper."""
-import io
+import functools
 import queue
+import struct
+import threading
 import time
-from typing import Callable, Optional
+import wave
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 import sounddevice as sd
 from scipy.io import wavfile
 from scipy import signal
 import numpy as np
 
+try:
+    import webrtcvad
+except Exception:
+    webrtcvad = None
+
+# A short frame whose RMS is above this (200 on the int16 scale) counts as
+# sound. Clips with fewer than SPEECH_MIN_FRAMES such frames are treated as no
+# speech at all; _preprocess_audio leaves them at their recorded level instead
+# of normalizing them, so the transcription-side gate still sees them as
+# silent. Judging per frame keeps a short utterance in a long quiet clip from
+# being averaged away.
+SPEECH_RMS_THRESHOLD = 200 / 32768
+SPEECH_FRAME_MS = 50
+SPEECH_MIN_FRAMES = 3
+
 
 def stream_audio(
     duration: Optional[float] = None,
@@ -20,7 +38,31 @@ def stream_audio(
     Capture audio from microphone and optionally call on_chunk for each block.
     Returns full audio as WAV bytes.
     """
+    full_audio, sample_rate = stream_audio_array(duration, sample_rate, blocksize, on_chunk)
+    return _array_to_wav(full_audio, sample_rate)
+
+
+def stream_audio_array(
+    duration: Optional[float] = None,
+    sample_rate: int = 16000,
+    blocksize: int = 4096,
+    on_chunk: Optional[Callable[[bytes], None]] = None,
+    wav_path: Optional[str] = None,
+) -> Tuple[np.ndarray, int]:
+    """
+    Same capture as stream_audio, but returns the preprocessed float32 samples
+    and sample rate instead of encoded WAV bytes, so callers can hand the
+    array straight to a local model or write it with save_wav.
+    If `wav_path` is given, the raw capture is appended to that 16-bit WAV
+    block by block, so the file is complete the moment recording stops.
+    """
     audio_queue = queue.Queue()
+    writer = None
+    if wav_path:
+        writer = wave.open(wav_path, "wb")
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
 
     def audio_callback(indata, frames, time_info, status):
         if status:
@@ -38,27 +80,114 @@ def stream_audio(
     stream.start()
 
     print("Recording... (Press Ctrl+C to stop)")
-    audio_data = []
+    audio_data = _SampleBuffer((duration or 60.0) * sample_rate)
     try:
         while True:
             chunk = audio_queue.get(timeout=0.5 if duration is None else (duration / 10))
             audio_data.append(chunk)
+            if writer:
+                writer.writeframes(_to_int16(chunk).tobytes())
             if on_chunk:
                 # Convert chunk to bytes for Whisper
                 wav_bytes = _array_to_wav(chunk, sample_rate)
                 on_chunk(wav_bytes)
-            if duration and len(audio_data) * (blocksize / sample_rate) >= duration:
+            if duration and len(audio_data) >= duration * sample_rate:
                 break
     except KeyboardInterrupt:
         print("\nRecording stopped.")
     finally:
         stream.stop()
         stream.close()
+        if writer:
+            writer.close()
 
-    # Concatenate and preprocess all audio data
-    full_audio = np.concatenate(audio_data, axis=0)
-    full_audio = _preprocess_audio(full_audio, sample_rate)
-    return _array_to_wav(full_audio, sample_rate)
+    # Preprocess all audio data (already contiguous, no concatenate needed)
+    full_audio = _preprocess_audio(audio_data.view(), sample_rate)
+    return (full_audio, sample_rate)
+
+
+class _SampleBuffer:
+    """Mono float32 capture buffer.
+
+    Preallocated for the expected length and grown by doubling if needed, so
+    each block is copied in once and no list of blocks has to be
+    concatenated when recording stops.
+    """
+
+    def __init__(self, initial_samples: float):
+        self._buf = np.empty(max(int(initial_samples), 1), dtype=np.float32)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, block: np.ndarray) -> None:
+        samples = block if block.ndim == 1 else block[:, 0]
+        end = self._size + len(samples)
+        if end > len(self._buf):
+            grown = np.empty(max(end, 2 * len(self._buf)), dtype=np.float32)
+            grown[:self._size] = self._buf[:self._size]
+            self._buf = grown
+        self._buf[self._size:end] = samples
+        self._size = end
+
+    def view(self) -> np.ndarray:
+        """The samples recorded so far (a view, not a copy)."""
+        return self._buf[:self._size]
+
+
+def stream_audio_chunks(
+    window_seconds: float = 30.0,
+    sample_rate: int = 16000,
+    blocksize: int = 4096,
+    stop_event: Optional[threading.Event] = None,
+) -> Iterator[np.ndarray]:
+    """
+    Capture audio from microphone and yield raw float32 windows of
+    `window_seconds` as soon as each one is filled, so callers can transcribe
+    while recording continues. Stops on Ctrl+C or when `stop_event` is set;
+    the final partial window is flushed before returning.
+    """
+    audio_queue = queue.Queue()
+
+    def audio_callback(indata, frames, time_info, status):
+        if status:
+            print(f"Audio status: {status}")
+        audio_queue.put(indata.copy())
+
+    stream = sd.InputStream(
+        samplerate=sample_rate,
+        channels=1,
+        blocksize=blocksize,
+        callback=audio_callback,
+        dtype=np.float32,
+    )
+    stream.start()
+
+    print("Recording... (Press Ctrl+C to stop)")
+    window_samples = int(window_seconds * sample_rate)
+    pending = []
+    pending_samples = 0
+    try:
+        while stop_event is None or not stop_event.is_set():
+            try:
+                chunk = audio_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            pending.append(chunk[:, 0])
+            pending_samples += len(chunk)
+            if pending_samples >= window_samples:
+                yield np.concatenate(pending)
+                pending = []
+                pending_samples = 0
+    except KeyboardInterrupt:
+        print("\nRecording stopped.")
+    finally:
+        stream.stop()
+        stream.close()
+
+    if pending:
+        yield np.concatenate(pending)
 
 
 def stream_audio_auto_stop(
@@ -69,20 +198,28 @@ def stream_audio_auto_stop(
     min_capture: float = 1.2,
     max_duration: float = 120.0,
     on_chunk: Optional[Callable[[bytes], None]] = None,
+    vad_aggressiveness: Optional[int] = None,
+    vad_silence_ms: int = 800,
 ) -> bytes:
     """Capture audio and auto-stop after sustained silence.
 
     - Starts capturing immediately, no keypress needed.
     - Stops after `silence_duration` seconds of silence once speech has started.
+    - With `vad_aggressiveness` (0-3) and webrtcvad installed, WebRTC VAD
+      decides instead: capture ends after `vad_silence_ms` of non-speech.
     - Enforces `min_capture` to avoid premature stop and `max_duration` as safety.
     - Returns full audio as WAV bytes.
     """
     audio_queue = queue.Queue()
+    endpointer = _make_endpointer(vad_aggressiveness, sample_rate, vad_silence_ms)
 
     def audio_callback(indata, frames, time_info, status):
         if status:
             print(f"Audio status: {status}")
-        audio_queue.put(indata.copy())
+        chunk = indata.copy()
+        if endpointer:
+            endpointer.feed(chunk)
+        audio_queue.put(chunk)
 
     stream = sd.InputStream(
         samplerate=sample_rate,
@@ -94,7 +231,7 @@ def stream_audio_auto_stop(
     stream.start()
 
     print("Recording... (auto-stops after silence)")
-    audio_data = []
+    audio_data = _SampleBuffer(max_duration * sample_rate)
     start_time = time.time()
     speech_started = False
     silence_start = None
@@ -104,10 +241,12 @@ def stream_audio_auto_stop(
             chunk = audio_queue.get(timeout=0.5)
             audio_data.append(chunk)
 
-            rms = float(np.sqrt(np.mean(np.square(chunk))))
             now = time.time()
 
-            if rms > silence_threshold:
+            if endpointer:
+                if endpointer.done.is_set() and (now - start_time) >= min_capture:
+                    break
+            elif _rms(chunk) > silence_threshold:
                 speech_started = True
                 silence_start = None
             else:
@@ -128,51 +267,314 @@ def stream_audio_auto_stop(
         stream.stop()
         stream.close()
 
-    if not audio_data:
+    if not len(audio_data):
         return b""
 
-    full_audio = np.concatenate(audio_data, axis=0)
-    full_audio = _preprocess_audio(full_audio, sample_rate)
+    full_audio = _preprocess_audio(audio_data.view(), sample_rate)
     return _array_to_wav(full_audio, sample_rate)
 
 
+def stream_audio_incremental(
+    transcribe: Callable[[np.ndarray], Tuple[str, List[Dict]]],
+    on_partial: Optional[Callable[[str], None]] = None,
+    on_final: Optional[Callable[[str], None]] = None,
+    sample_rate: int = 16000,
+    blocksize: int = 4096,
+    min_chunk_seconds: float = 1.0,
+    max_buffer_seconds: float = 20.0,
+    silence_threshold: float = 0.010,
+    silence_duration: float = 1.9,
+    min_capture: float = 1.2,
+    max_duration: float = 120.0,
+    stop_event: Optional[threading.Event] = None,
+    vad_aggressiveness: Optional[int] = None,
+    vad_silence_ms: int = 800,
+) -> str:
+    """Capture audio and transcribe it while the user is still speaking.
+
+    Whisper-Streaming style update loop: every `min_chunk_seconds` of new audio,
+    the unconfirmed tail of the buffer is passed to `transcribe` (a
+    float32 array -> (text, segments) callable such as transcribe_audio).
+    Words on which two consecutive hypotheses agree (LocalAgreement-2) are
+    confirmed and passed to `on_partial`; the buffer is trimmed once a
+    confirmed word ends a sentence, or when it grows past `max_buffer_seconds`.
+
+    Stops after `silence_duration` seconds of silence once speech has started
+    (same rules as stream_audio_auto_stop, including the optional WebRTC VAD
+    endpointing), after `max_duration`, or when `stop_event` is set. The
+    remaining tail is then transcribed once more and the full text is passed
+    to `on_final` and returned.
+    """
+    audio_queue = queue.Queue()
+    endpointer = _make_endpointer(vad_aggressiveness, sample_rate, vad_silence_ms)
+
+    def audio_callback(indata, frames, time_info, status):
+        if status:
+            print(f"Audio status: {status}")
+        chunk = indata.copy()
+        if endpointer:
+            endpointer.feed(chunk)
+        audio_queue.put(chunk)
+
+    stream = sd.InputStream(
+        samplerate=sample_rate,
+        channels=1,
+        blocksize=blocksize,
+        callback=audio_callback,
+        dtype=np.float32,
+    )
+    stream.start()
+
+    print("Recording... (auto-stops after silence)")
+    buffer = np.zeros(0, dtype=np.float32)
+    buffer_start = 0  # absolute sample index of buffer[0]
+    total_samples = 0
+    last_update = 0
+    speech_started = False
+    silent_samples = 0
+    confirmed: List[Tuple[str, float, bool]] = []  # every word confirmed so far
+    committed = 0  # how many of them lie inside the current buffer
+    prev_tail: List[Tuple[str, float, bool]] = []
+
+    def hypothesis() -> List[Tuple[str, float, bool]]:
+        audio = _preprocess_audio(buffer, sample_rate)
+        _text, segments = transcribe(audio.astype(np.float32, copy=False))
+        return _segment_words(segments, buffer_start / sample_rate)
+
+    try:
+        # Silence and timing are measured in samples, not wall-clock time, so
+        # the time spent inside `transcribe` does not count as silence.
+        while stop_event is None or not stop_event.is_set():
+            # Take everything that arrived while the last transcription ran
+            try:
+                chunks = [audio_queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            while not audio_queue.empty():
+                chunks.append(audio_queue.get_nowait())
+            block = np.concatenate(chunks)[:, 0]
+            buffer = np.concatenate((buffer, block))
+            total_samples += len(block)
+
+            stop = False
+            for chunk in chunks:
+                if _rms(chunk) > silence_threshold:
+                    speech_started = True
+                    silent_samples = 0
+                elif speech_started:
+                    silent_samples += len(chunk)
+                    if (
+                        endpointer is None
+                        and silent_samples >= silence_duration * sample_rate
+                        and total_samples >= min_capture * sample_rate
+                    ):
+                        stop = True
+            if endpointer and endpointer.done.is_set() and total_samples >= min_capture * sample_rate:
+                stop = True
+            if stop or total_samples >= max_duration * sample_rate:
+                break
+
+            if not speech_started or total_samples - last_update < min_chunk_seconds * sample_rate:
+                continue
+            last_update = total_samples
+
+            tail = hypothesis()[committed:]
+            agreed = _agreed_prefix(prev_tail, tail)
+            prev_tail = tail[len(agreed):]
+            if agreed:
+                confirmed.extend(agreed)
+                committed += len(agreed)
+                if on_partial:
+                    on_partial(" ".join(w for w, _end, _exact in agreed))
+
+            # Skip the confirmed part: drop audio up to the last confirmed word
+            # once it closes a sentence at a segment boundary (exact timestamp),
+            # or unconditionally when the buffer would otherwise keep growing.
+            if committed:
+                word, end, exact = confirmed[-1]
+                too_long = len(buffer) > max_buffer_seconds * sample_rate
+                if too_long or (exact and word.endswith((".", "?", "!"))):
+                    cut = min(max(int(end * sample_rate) - buffer_start, 0), len(buffer))
+                    buffer = buffer[cut:]
+                    buffer_start += cut
+                    committed = 0
+    finally:
+        stream.stop()
+        stream.close()
+
+    if speech_started and len(buffer):
+        rest = hypothesis()[committed:]
+        confirmed.extend(rest)
+    text = " ".join(w for w, _end, _exact in confirmed).strip()
+    if on_final:
+        on_final(text)
+    return text
+
+
+def _segment_words(segments: List[Dict], offset: float) -> List[Tuple[str, float, bool]]:
+    """Split segments into (word, absolute end time, exact) tuples.
+
+    Segments only carry segment-level timing, so word end times are spread
+    evenly across the segment; only a segment's last word has an exact one.
+    """
+    words = []
+    for seg in segments:
+        parts = seg.get("text", "").split()
+        start = float(seg.get("start") or 0.0)
+        step = (float(seg.get("end") or start) - start) / max(len(parts), 1)
+        for i, word in enumerate(parts, 1):
+            words.append((word, offset + start + step * i, i == len(parts)))
+    return words
+
+
+def _agreed_prefix(prev: List[Tuple[str, float, bool]], curr: List[Tuple[str, float, bool]]) -> List[Tuple[str, float, bool]]:
+    """Longest common word prefix of two hypotheses, ignoring case and punctuation."""
+    n = 0
+    for (a, _, _), (b, _, _) in zip(prev, curr):
+        if a.lower().strip(".,?!;:\"'") != b.lower().strip(".,?!;:\"'"):
+            break
+        n += 1
+    return curr[:n]
+
+
+class _VadEndpointer:
+    """Detect the end of an utterance with WebRTC VAD.
+
+    Blocks are fed from the audio callback, cut into 30 ms int16 frames and
+    classified; `done` is set after `silence_ms` of consecutive non-speech
+    frames once at least one speech frame has been seen.
+    """
+
+    FRAME_MS = 30
+
+    def __init__(self, aggressiveness: int, sample_rate: int, silence_ms: int):
+        self._vad = webrtcvad.Vad(aggressiveness)
+        self._sample_rate = sample_rate
+        self._frame = sample_rate * self.FRAME_MS // 1000
+        self._silence_ms = silence_ms
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._speech_seen = False
+        self._silent_ms = 0
+        self.done = threading.Event()
+
+    def feed(self, block: np.ndarray) -> None:
+        pcm = np.concatenate((self._pending, _to_int16(block.reshape(-1))))
+        usable = len(pcm) - len(pcm) % self._frame
+        for i in range(0, usable, self._frame):
+            if self._vad.is_speech(pcm[i:i + self._frame].tobytes(), self._sample_rate):
+                self._speech_seen = True
+                self._silent_ms = 0
+            elif self._speech_seen:
+                self._silent_ms += self.FRAME_MS
+        self._pending = pcm[usable:]
+        if self._speech_seen and self._silent_ms >= self._silence_ms:
+            self.done.set()
+
+
+def _make_endpointer(
+    vad_aggressiveness: Optional[int], sample_rate: int, silence_ms: int
+) -> Optional[_VadEndpointer]:
+    """Return a VAD endpointer, or None to keep the RMS silence heuristic.
+
+    None when VAD was not requested, webrtcvad is not installed, or the
+    sample rate is one WebRTC VAD does not support.
+    """
+    if vad_aggressiveness is None:
+        return None
+    if webrtcvad is None:
+        print("webrtcvad not installed; falling back to level-based silence detection.")
+        return None
+    if sample_rate not in (8000, 16000, 32000, 48000):
+        return None
+    return _VadEndpointer(vad_aggressiveness, sample_rate, silence_ms)
+
+
+def _rms(block: np.ndarray) -> float:
+    """Root-mean-square level of a block; a single dot product, no squared temporary."""
+    x = block.reshape(-1)
+    if not x.size:
+        return 0.0
+    return float(np.sqrt(np.dot(x, x) / x.size))
+
+
+def _has_speech_frames(samples: np.ndarray, sample_rate: int) -> bool:
+    """True if at least SPEECH_MIN_FRAMES frames of SPEECH_FRAME_MS are above
+    SPEECH_RMS_THRESHOLD (or all of them, for clips shorter than that)."""
+    x = np.asarray(samples, dtype=np.float32).reshape(-1)
+    frame = max(int(sample_rate * SPEECH_FRAME_MS / 1000), 1)
+    n = x.size // frame
+    if n == 0:
+        return _rms(x) > SPEECH_RMS_THRESHOLD
+    frames = x[: n * frame].reshape(n, frame)
+    # Per-frame mean square, compared against the squared threshold
+    energy = np.einsum("ij,ij->i", frames, frames) / frame
+    return int(np.count_nonzero(energy > SPEECH_RMS_THRESHOLD ** 2)) >= min(SPEECH_MIN_FRAMES, n)
+
+
+@functools.lru_cache(maxsize=8)
+def _hp_sos(order: int, cutoff: float, sample_rate: int, dtype: str = "float64") -> np.ndarray:
+    """Butterworth high-pass coefficients, designed once per (order, cutoff, rate, dtype).
+
+    sosfilt computes in the wider of the coefficient and input dtypes, so
+    float32 captures need float32 coefficients to stay float32.
+    """
+    return signal.butter(order, cutoff, 'hp', fs=sample_rate, output='sos').astype(dtype)
+
+
 def _preprocess_audio(audio_array: np.ndarray, sample_rate: int) -> np.ndarray:
     """
-    Preprocess audio: normalize, remove DC offset, apply gentle high-pass filter.
+    Preprocess audio: apply gentle high-pass filter, then normalize.
     Reduces hallucination by cleaning up background noise and improving clarity.
+    The 80 Hz high-pass also removes any DC offset, so no separate mean
+    subtraction or pre-filter normalization pass is needed.
+    Captures with no speech-level frames (see _has_speech_frames) are only
+    filtered: normalizing would lift the noise floor to full scale and hide
+    that nothing was said.
     """
-    # Remove DC offset
-    audio_array = audio_array - np.mean(audio_array)
-    
+    # Filter along time, so (N,) and (N, 1) captures behave the same
+    # float32 in, float32 out (float64 input keeps float64 coefficients)
+    dtype = np.result_type(audio_array.dtype, np.float32)
+    audio_array = signal.sosfilt(_hp_sos(5, 80, sample_rate, dtype.name), audio_array, axis=0)
+    if not _has_speech_frames(audio_array, sample_rate):
+        return audio_array
+
     # Normalize to prevent clipping (keep some headroom)
-    max_val = np.max(np.abs(audio_array))
-    if max_val > 0:
-        audio_array = audio_array / (max_val * 1.1)
-    
-    # Apply gentle high-pass filter to reduce low-frequency rumble
-    # 80 Hz cutoff
-    sos = signal.butter(5, 80, 'hp', fs=sample_rate, output='sos')
-    audio_array = signal.sosfilt(sos, audio_array)
-    
-    # Re-normalize after filtering
-    max_val = np.max(np.abs(audio_array))
+    max_val = max(audio_array.max(), -audio_array.min())
     if max_val > 0:
-        audio_array = audio_array / (max_val * 1.1)
-    
+        np.multiply(audio_array, 1.0 / (max_val * 1.1), out=audio_array)
+
     return audio_array
 
 
+def _to_int16(audio_array: np.ndarray) -> np.ndarray:
+    # Ensure float32 and in range [-1, 1]; clip in place when the cast already copied
+    samples = np.asarray(audio_array, dtype=np.float32)
+    samples = np.clip(samples, -1.0, 1.0, out=None if samples is audio_array else samples)
+
+    # Scale straight into the int16 output (truncating, as np.int16() did)
+    out = np.empty(samples.shape, dtype=np.int16)
+    np.multiply(samples, 32767, out=out, casting="unsafe")
+    return out
+
+
 def _array_to_wav(audio_array: np.ndarray, sample_rate: int) -> bytes:
-    """Convert numpy audio array to WAV bytes."""
-    # Ensure float32 and in range [-1, 1]
-    audio_array = np.asarray(audio_array, dtype=np.float32)
-    audio_array = np.clip(audio_array, -1.0, 1.0)
-    
-    # Convert to int16 with proper scaling
-    audio_int16 = np.int16(audio_array * 32767)
-    
-    # Write to bytes buffer
-    buffer = io.BytesIO()
-    wavfile.write(buffer, sample_rate, audio_int16)
-    buffer.seek(0)
-    return buffer.read()
+    """Convert numpy audio array to 16-bit PCM WAV bytes.
+
+    The 44-byte RIFF header is packed directly rather than going through
+    scipy's writer and a BytesIO.
+    """
+    pcm = _to_int16(audio_array)
+    channels = 1 if pcm.ndim == 1 else pcm.shape[1]
+    nbytes = pcm.nbytes
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + nbytes, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, sample_rate * channels * 2, channels * 2, 16,
+        b"data", nbytes,
+    )
+    return header + pcm.tobytes()
+
+
+def save_wav(path: str, audio_array: np.ndarray, sample_rate: int) -> None:
+    """Write a float audio array to disk as 16-bit PCM WAV without an intermediate bytes copy."""
+    wavfile.write(path, sample_rate, _to_int16(audio_array))
@@ -1,18 +1,67 @@
 """Real-time transcription from live audio chunks."""
 import io
-from typing import Tuple, Dict, List, Optional
-from openai import OpenAI
+import queue
+import threading
+from typing import Callable, Iterator, Tuple, Dict, List, Optional, Union
 from scipy.io import wavfile
 import numpy as np
 
+from .live_capture import _array_to_wav, _has_speech_frames, _preprocess_audio, stream_audio_chunks
+from .local_whisper import iter_local_segments, local_backend_enabled, transcribe_local
+from .openai_client import get_client
 
-def transcribe_audio(audio_bytes: bytes, language: str = "en") -> Tuple[str, List[Dict]]:
+
+def _has_speech(audio: Union[bytes, np.ndarray], sample_rate: int = 16000) -> bool:
+    """Cheap energy gate run before any model or API call.
+
+    Returns False only when no short frame of the clip reaches speech level,
+    e.g. a recording started by accident. This relies on _preprocess_audio
+    not normalizing such clips, so their level here is still the captured
+    one. `sample_rate` applies to arrays; WAV bytes carry their own. Audio
+    that cannot be decoded is passed through.
+    """
+    if isinstance(audio, np.ndarray):
+        samples = audio
+    else:
+        try:
+            sample_rate, samples = wavfile.read(io.BytesIO(audio))
+        except Exception:
+            return True
+        if samples.dtype == np.int16:
+            samples = samples.astype(np.float32) / 32768
+    if not samples.size:
+        return False
+    return _has_speech_frames(samples, sample_rate)
+
+
+def transcribe_audio(
+    audio_bytes: Union[bytes, np.ndarray], language: str = "en", sample_rate: int = 16000
+) -> Tuple[str, List[Dict]]:
     """
     Transcribe full audio file via Whisper with detailed segments.
     Uses response_format=verbose_json to get segment-level timing and text.
+    With WHISPER_BACKEND=local the shared faster-whisper model is used instead.
+    Accepts WAV bytes or a float32 sample array; arrays go straight to the
+    local model and are only WAV-encoded for the API path.
+    Near-silent clips return ("", []) without calling either backend.
     Returns (full_text, segments).
     """
-    client = OpenAI()
+    if not _has_speech(audio_bytes, sample_rate):
+        return ("", [])
+
+    if local_backend_enabled():
+        try:
+            return transcribe_local(audio_bytes, language=language)
+        except Exception as e:
+            print(f"Transcription error: {e}")
+            import traceback
+            traceback.print_exc()
+            return ("", [])
+
+    if isinstance(audio_bytes, np.ndarray):
+        audio_bytes = _array_to_wav(audio_bytes, sample_rate)
+
+    client = get_client()
     try:
         result = client.audio.transcriptions.create(
             model="whisper-1",
@@ -22,25 +71,18 @@ def transcribe_audio(audio_bytes: bytes, language: str = "en") -> Tuple[str, Lis
         )
         
         full_text = result.text.strip()
-        segments = []
-        
-        if hasattr(result, 'segments'):
-            for seg in result.segments:
-                # Handle both dict and object responses
-                if isinstance(seg, dict):
-                    segments.append({
-                        "start": seg.get("start", 0),
-                        "end": seg.get("end", 0),
-                        "text": seg.get("text", "").strip(),
-                    })
-                else:
-                    # TranscriptionSegment object
-                    segments.append({
-                        "start": getattr(seg, "start", 0),
-                        "end": getattr(seg, "end", 0),
-                        "text": getattr(seg, "text", "").strip(),
-                    })
-        
+        raw_segments = getattr(result, "segments", None) or []
+        # Handle both dict and TranscriptionSegment object responses
+        get = dict.get if raw_segments and isinstance(raw_segments[0], dict) else getattr
+        segments = [
+            {
+                "start": get(seg, "start", 0),
+                "end": get(seg, "end", 0),
+                "text": (get(seg, "text", "") or "").strip(),
+            }
+            for seg in raw_segments
+        ]
+
         return (full_text, segments)
     except Exception as e:
         print(f"Transcription error: {e}")
@@ -51,7 +93,17 @@ def transcribe_audio(audio_bytes: bytes, language: str = "en") -> Tuple[str, Lis
 
 def translate_audio(audio_bytes: bytes, source_language: Optional[str] = None) -> Tuple[str, List[Dict]]:
     """Translate audio to English using Whisper translate endpoint."""
-    client = OpenAI()
+    if local_backend_enabled():
+        try:
+            full_text, _ = transcribe_local(audio_bytes, language=source_language, task="translate")
+            return (full_text, [])
+        except Exception as e:
+            print(f"Translation error: {e}")
+            import traceback
+            traceback.print_exc()
+            return ("", [])
+
+    client = get_client()
     try:
         result = client.audio.translations.create(
             model="whisper-1",
@@ -68,7 +120,14 @@ def translate_audio(audio_bytes: bytes, source_language: Optional[str] = None) -
 
 def transcribe_chunk(audio_bytes: bytes, language: str = "en") -> str:
     """Transcribe a single audio chunk via Whisper API."""
-    client = OpenAI()
+    if local_backend_enabled():
+        try:
+            return transcribe_local(audio_bytes, language=language)[0]
+        except Exception as e:
+            print(f"Transcription error: {e}")
+            return ""
+
+    client = get_client()
     try:
         result = client.audio.transcriptions.create(
             model="whisper-1",
@@ -82,20 +141,94 @@ def transcribe_chunk(audio_bytes: bytes, language: str = "en") -> str:
 
 
 def stream_transcription(
-    audio_bytes: bytes,
+    audio_bytes: Union[bytes, np.ndarray],
     sample_rate: int = 16000,
     chunk_duration: float = 5.0,
     language: str = "en",
-) -> Tuple[str, list]:
+) -> Iterator[Dict]:
     """
-    Transcribe audio using full-file approach (reduces hallucination vs overlapping chunks).
-    Returns (full_text, segments).
-    """
-    full_text, segments = transcribe_audio(audio_bytes, language)
-    
-    # Print each segment with timing
-    for seg in segments:
-        if seg["text"]:
+    Transcribe audio using full-file approach (reduces hallucination vs overlapping chunks),
+    yielding {"start", "end", "text"} segments as soon as they are available.
+    With the local backend segments are yielded while decoding continues; the
+    API returns everything at once, so its segments are yielded after the call.
+
+        for seg in stream_transcription(audio_bytes):
             print(f"[{seg['start']:.1f}s-{seg['end']:.1f}s] {seg['text']}")
-    
-    return (full_text, segments)
+    """
+    if not _has_speech(audio_bytes, sample_rate):
+        return
+    if local_backend_enabled():
+        yield from iter_local_segments(audio_bytes, language=language)
+        return
+    _full_text, segments = transcribe_audio(audio_bytes, language, sample_rate=sample_rate)
+    yield from segments
+
+
+def transcribe_while_recording(
+    language: str = "en",
+    sample_rate: int = 16000,
+    window_seconds: float = 30.0,
+    on_segment: Optional[Callable[[Dict], None]] = None,
+    stop_event: Optional[threading.Event] = None,
+) -> Tuple[bytes, str, List[Dict]]:
+    """
+    Record from the microphone and transcribe each captured window on a
+    background thread, so transcription overlaps recording instead of
+    starting after it. Segment timestamps are offset to the full recording.
+    Ctrl+C ends the recording (setting `stop_event`, if given) and returns
+    everything captured up to that point.
+    Returns (audio_bytes, full_text, segments).
+    """
+    windows: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize=8)
+    texts: List[str] = []
+    segments: List[Dict] = []
+
+    def consume():
+        offset = 0.0
+        while True:
+            window = windows.get()
+            if window is None:
+                break
+            wav_bytes = _array_to_wav(_preprocess_audio(window, sample_rate), sample_rate)
+            text, window_segments = transcribe_audio(wav_bytes, language)
+            if text:
+                texts.append(text)
+            for seg in window_segments:
+                seg["start"] = seg["start"] + offset
+                seg["end"] = seg["end"] + offset
+                segments.append(seg)
+                if on_segment and seg["text"]:
+                    on_segment(seg)
+            offset += len(window) / sample_rate
+
+    worker = threading.Thread(target=consume, daemon=True)
+    worker.start()
+
+    stop = stop_event or threading.Event()
+    chunks = stream_audio_chunks(window_seconds, sample_rate, stop_event=stop)
+    captured: List[np.ndarray] = []
+    queued = 0  # how many of `captured` have been handed to the consumer
+    try:
+        try:
+            for window in chunks:
+                captured.append(window)
+                windows.put(window)
+                queued += 1
+        except KeyboardInterrupt:
+            # Ctrl+C outside stream_audio_chunks' own handler (e.g. while
+            # blocked on the full queue): stop capturing but keep what was
+            # recorded, including the partial window the generator flushes.
+            print("\nRecording stopped.")
+            stop.set()
+            captured.extend(chunks)
+        for window in captured[queued:]:
+            windows.put(window)
+    finally:
+        chunks.close()
+        windows.put(None)
+        worker.join()
+
+    if not captured:
+        return (b"", "", [])
+    full_audio = _preprocess_audio(np.concatenate(captured), sample_rate)
+    return (_array_to_wav(full_audio, sample_rate), " ".join(texts).strip(), segments)
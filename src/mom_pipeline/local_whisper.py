@@ -0,0 +1,167 @@
+"""Process-resident faster-whisper model for local transcription.
+
+The model is loaded once per process and reused for every call, so repeated
+recordings skip both the network round-trip and the model load.
+"""
+import io
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from scipy.io import wavfile
+
+try:
+    from faster_whisper import WhisperModel
+except Exception:
+    WhisperModel = None
+
+from .config import DEFAULT_WHISPER_BACKEND, LOCAL_WHISPER_MODEL, OPENAI_WHISPER_MODEL
+
+
+_MODEL = None
+_MODEL_LOCK = threading.Lock()
+_WARMUP_THREAD: Optional[threading.Thread] = None
+
+# faster-whisper expects arrays at this rate; other WAVs go through its decoder
+_MODEL_SAMPLE_RATE = 16000
+
+
+def local_backend_enabled() -> bool:
+    """True when WHISPER_BACKEND=local is set in the environment."""
+    return os.getenv("WHISPER_BACKEND", DEFAULT_WHISPER_BACKEND).lower() == "local"
+
+
+def backend_id() -> str:
+    """Resolved backend, model and (local) compute type, e.g. "local:small:int8".
+
+    Used in cache keys, so switching model or quantization never returns a
+    transcript made by another one, and an unset WHISPER_BACKEND matches the
+    explicit default.
+    """
+    if local_backend_enabled():
+        _device, compute_type = _select_device()
+        return f"local:{os.getenv('LOCAL_WHISPER_MODEL', LOCAL_WHISPER_MODEL)}:{compute_type}"
+    return f"openai:{OPENAI_WHISPER_MODEL}"
+
+
+def _select_device() -> Tuple[str, str]:
+    """Pick (device, compute_type) for the model.
+
+    Weights are quantized to int8 by default: "int8" on CPU (x86 VNNI / ARM
+    dotprod kernels) and "int8_float16" on CUDA. This roughly halves weight
+    bandwidth for a small WER cost; set LAZY_PROMPT_COMPUTE_TYPE (e.g.
+    "float32" or "float16") to trade speed back for accuracy.
+    """
+    device = "cpu"
+    try:
+        import ctranslate2
+
+        if ctranslate2.get_cuda_device_count() > 0:
+            device = "cuda"
+    except Exception:
+        pass
+    default_type = "int8_float16" if device == "cuda" else "int8"
+    return (device, os.getenv("LAZY_PROMPT_COMPUTE_TYPE", default_type))
+
+
+def get_model():
+    """Return the shared WhisperModel, loading it on first use."""
+    global _MODEL
+    if _MODEL is None:
+        with _MODEL_LOCK:
+            if _MODEL is None:
+                if WhisperModel is None:
+                    raise RuntimeError(
+                        "faster-whisper not available. Install via `pip install faster-whisper`."
+                    )
+                device, compute_type = _select_device()
+                model_name = os.getenv("LOCAL_WHISPER_MODEL", LOCAL_WHISPER_MODEL)
+                _MODEL = WhisperModel(model_name, device=device, compute_type=compute_type)
+    return _MODEL
+
+
+def warmup() -> None:
+    """Load the model and decode one second of silence so CTranslate2 kernels
+    are initialised before the first real recording.
+    """
+    model = get_model()
+    segments_iter, _info = model.transcribe(np.zeros(16000, dtype=np.float32), language="en")
+    list(segments_iter)  # segments are decoded lazily
+
+
+def start_warmup() -> threading.Thread:
+    """Run warmup() on a daemon thread; errors surface on the first transcription.
+
+    Only the first call starts a thread; later calls return it, so a second
+    silence decode never competes with a real transcription.
+    """
+    global _WARMUP_THREAD
+
+    def run():
+        try:
+            warmup()
+        except Exception:
+            pass
+
+    with _MODEL_LOCK:
+        if _WARMUP_THREAD is None:
+            _WARMUP_THREAD = threading.Thread(target=run, daemon=True)
+            _WARMUP_THREAD.start()
+        return _WARMUP_THREAD
+
+
+def _decode_wav(data: bytes) -> Union[np.ndarray, io.BytesIO]:
+    """Decode 16 kHz WAV bytes in memory to a mono float32 array.
+
+    Anything scipy cannot read, or at another sample rate, is handed back as a
+    file object for faster-whisper's own (PyAV) decoder to resample.
+    """
+    try:
+        sr, arr = wavfile.read(io.BytesIO(data))
+    except Exception:
+        return io.BytesIO(data)
+    if sr != _MODEL_SAMPLE_RATE:
+        return io.BytesIO(data)
+    if arr.ndim > 1:
+        arr = arr.mean(axis=1)
+    if arr.dtype == np.int16:
+        return arr.astype(np.float32) / 32768.0
+    return arr.astype(np.float32, copy=False)
+
+
+def iter_local_segments(
+    audio: Union[bytes, np.ndarray],
+    language: Optional[str] = "en",
+    task: str = "transcribe",
+    beam_size: int = 1,
+) -> Iterator[Dict]:
+    """Yield {"start", "end", "text"} segments as the local model decodes them.
+    faster-whisper decodes lazily, so the first segment arrives after its own
+    window is processed rather than after the whole clip.
+    Greedy decoding (beam_size=1) by default, which suits short dictated clips.
+    """
+    model = get_model()
+    segments_iter, _info = model.transcribe(
+        np.asarray(audio, dtype=np.float32) if isinstance(audio, np.ndarray) else _decode_wav(audio),
+        language=language,
+        task=task,
+        vad_filter=True,
+        beam_size=beam_size,
+    )
+    for s in segments_iter:
+        yield {"start": s.start, "end": s.end, "text": s.text.strip()}
+
+
+def transcribe_local(
+    audio: Union[bytes, np.ndarray],
+    language: Optional[str] = "en",
+    task: str = "transcribe",
+    beam_size: int = 1,
+) -> Tuple[str, List[Dict]]:
+    """Transcribe WAV bytes or a 16 kHz float32 array with the shared local model.
+    Returns (full_text, segments) in the same shape as the API path.
+    """
+    segments = list(iter_local_segments(audio, language=language, task=task, beam_size=beam_size))
+    full_text = " ".join(s["text"] for s in segments if s["text"]).strip()
+    return (full_text, segments)
@@ -1,8 +1,14 @@
-from typing import Dict, List, Tuple
+import itertools
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
 
-from openai import OpenAI
+import orjson
 
+from .cache import get_cache, make_key
 from .config import MOM_MODEL
+from .openai_client import get_client
+
+# Bump when the prompt or output structure changes so old cached MoMs are not reused.
+MOM_SCHEMA_VERSION = 2
 
 
 MOM_SCHEMA_KEYS = {
@@ -20,15 +26,81 @@ MOM_SCHEMA_KEYS = {
     "summary",
 }
 
+_LIST_KEYS = frozenset({
+    "participants",
+    "agenda",
+    "discussion",
+    "decisions",
+    "actionItems",
+    "risks",
+    "dependencies",
+    "openQuestions",
+    "summary",
+})
 
-def _build_system_prompt() -> str:
-    return (
-        "You are a meticulous meeting minutes generator. "
-        "Use ONLY facts present in the transcript. "
-        "Do NOT invent speakers, owners, dates, or facts. "
-        "If data is missing, use empty lists/strings or nulls. "
-        "Return JSON with strictly the specified keys and types."
-    )
+
+_STR = {"type": "string"}
+_NULLABLE_STR = {"type": ["string", "null"]}
+_STR_LIST = {"type": "array", "items": _STR}
+
+
+def _object(properties: Dict) -> Dict:
+    # Strict structured outputs require every property listed and no extras
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+# The API enforces this schema, so every reply has all MOM_SCHEMA_KEYS with
+# the right types and the prompt no longer has to spell the structure out.
+_MOM_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "minutes_of_meeting",
+        "strict": True,
+        "schema": _object({
+            "meetingTitle": _STR,
+            "dateTime": _STR,
+            "platform": _STR,
+            "participants": _STR_LIST,
+            "agenda": _STR_LIST,
+            "discussion": {
+                "type": "array",
+                "items": _object({"topic": _STR, "points": _STR_LIST}),
+            },
+            "decisions": _STR_LIST,
+            "actionItems": {
+                "type": "array",
+                "items": _object({
+                    "task": _STR,
+                    "owner": _NULLABLE_STR,
+                    "dueDate": _NULLABLE_STR,
+                    "priority": _NULLABLE_STR,
+                }),
+            },
+            "risks": _STR_LIST,
+            "dependencies": _STR_LIST,
+            "openQuestions": _STR_LIST,
+            "summary": _STR_LIST,
+        }),
+    },
+}
+
+
+# Everything static lives in the system message so it forms an identical
+# prefix on every call and is served from OpenAI's prompt cache; only the
+# metadata and transcript that follow it vary.
+_SYSTEM_PROMPT = (
+    "You are a meticulous meeting minutes generator. "
+    "Use ONLY facts present in the transcript. "
+    "Do NOT invent speakers, owners, dates, or facts. "
+    "If data is missing, use empty lists/strings or nulls. "
+    "Give dateTime as ISO 8601 when available, platform as 'Google Meet', "
+    "and a summary of 5 to 8 points."
+)
 
 
 def _build_user_prompt(transcript_text: str, metadata: Dict) -> str:
@@ -38,155 +110,133 @@ def _build_user_prompt(transcript_text: str, metadata: Dict) -> str:
         "platform": "Google Meet",
         "participants": metadata.get("participants") or [],
     }
-
-    guidance = (
-        "Target structure: {\n"
-        "  meetingTitle: string,\n"
-        "  dateTime: string (ISO if available),\n"
-        "  platform: 'Google Meet',\n"
-        "  participants: string[],\n"
-        "  agenda: string[],\n"
-        "  discussion: [{topic: string, points: string[]}],\n"
-        "  decisions: string[],\n"
-        "  actionItems: [{task: string, owner: string|null, dueDate: string|null, priority: string|null}],\n"
-        "  risks: string[],\n"
-        "  dependencies: string[],\n"
-        "  openQuestions: string[],\n"
-        "  summary: string[5..8]\n"
-        "}.\n"
-        "Fill only from transcript; otherwise leave empty or null."
+    return f"Metadata: {base}\n\nTranscript (cleaned):\n{transcript_text}"
+
+
+def generate_mom(transcript_text: str, metadata: Dict, use_cache: bool = True) -> Dict:
+    """Generate minutes for a cleaned transcript.
+
+    The result is cached on disk, keyed by the transcript, metadata, model and
+    prompt, so re-running a recording skips the chat call entirely.
+    """
+    cache = get_cache() if use_cache else None
+    key = make_key(
+        transcript_text,
+        "mom",
+        MOM_MODEL,
+        MOM_SCHEMA_VERSION,
+        _SYSTEM_PROMPT,
+        orjson.dumps(metadata, option=orjson.OPT_SORT_KEYS, default=str).decode(),
     )
-    return (
-        f"Metadata: {base}\n\n"
-        f"Transcript (cleaned):\n{transcript_text}\n\n"
-        f"{guidance}"
-    )
-
+    if cache is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
 
-def generate_mom(transcript_text: str, metadata: Dict) -> Dict:
-    client = OpenAI()
-    sys_prompt = _build_system_prompt()
+    client = get_client()
     user_prompt = _build_user_prompt(transcript_text, metadata)
 
     resp = client.chat.completions.create(
         model=MOM_MODEL,
         temperature=0,
-        response_format={"type": "json_object"},
+        response_format=_MOM_RESPONSE_FORMAT,
         messages=[
-            {"role": "system", "content": sys_prompt},
+            {"role": "system", "content": _SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt},
         ],
     )
     content = resp.choices[0].message.content
-    mom = {}  # will parse to dict
     try:
-        import json
-
-        mom = json.loads(content)
+        mom = orjson.loads(content)
     except Exception:
-        mom = {}
-
-    # Ensure key completeness and types
-    for k in MOM_SCHEMA_KEYS:
-        if k not in mom:
-            mom[k] = [] if k in {
-                "participants",
-                "agenda",
-                "discussion",
-                "decisions",
-                "actionItems",
-                "risks",
-                "dependencies",
-                "openQuestions",
-                "summary",
-            } else ""
+        # Only a refusal or truncated reply gets here; fall back to an empty MoM
+        mom = {k: [] if k in _LIST_KEYS else "" for k in MOM_SCHEMA_KEYS}
+        cache = None  # do not pin an unparseable reply
     mom["platform"] = "Google Meet"
+    if cache is not None:
+        cache.set(key, mom)
     return mom
 
 
-def render_markdown(mom: Dict) -> str:
-    # Deterministic Markdown rendering
-    parts: List[str] = []
-    parts.append(f"# Minutes of Meeting: {mom.get('meetingTitle','').strip()}")
-    parts.append("")
-    parts.append(f"- Date & Time: {mom.get('dateTime','').strip()}")
-    parts.append(f"- Platform: Google Meet")
-    participants = mom.get("participants", [])
-    parts.append(f"- Participants: {', '.join(participants) if participants else '—'}")
-    parts.append("")
-    agenda = mom.get("agenda", [])
-    parts.append("## Agenda")
-    if agenda:
-        for a in agenda:
-            parts.append(f"- {a}")
-    else:
-        parts.append("- —")
-    parts.append("")
+def _bullets(items: List, indent: str = "") -> Iterator[str]:
+    if not items:
+        yield f"{indent}- —"
+        return
+    for item in items:
+        yield f"{indent}- {item}"
+
 
-    parts.append("## Key Discussion Points")
-    discussion = mom.get("discussion", [])
+def _iter_markdown(mom: Dict) -> Iterator[str]:
+    """Yield the Markdown lines of a MoM, one section after another."""
+    get = mom.get
+    participants = get("participants", [])
+    yield f"# Minutes of Meeting: {get('meetingTitle', '').strip()}"
+    yield ""
+    yield f"- Date & Time: {get('dateTime', '').strip()}"
+    yield "- Platform: Google Meet"
+    yield f"- Participants: {', '.join(participants) if participants else '—'}"
+    yield ""
+
+    yield "## Agenda"
+    yield from _bullets(get("agenda", []))
+    yield ""
+
+    yield "## Key Discussion Points"
+    discussion = get("discussion", [])
     if discussion:
         for d in discussion:
-            parts.append(f"- {d.get('topic','')}")
+            yield f"- {d.get('topic', '')}"
             for p in d.get("points", []):
-                parts.append(f"  - {p}")
-    else:
-        parts.append("- —")
-    parts.append("")
-
-    parts.append("## Decisions Taken")
-    decisions = mom.get("decisions", [])
-    if decisions:
-        for d in decisions:
-            parts.append(f"- {d}")
+                yield f"  - {p}"
     else:
-        parts.append("- —")
-    parts.append("")
+        yield "- —"
+    yield ""
 
-    parts.append("## Action Items")
-    items = mom.get("actionItems", [])
+    yield "## Decisions Taken"
+    yield from _bullets(get("decisions", []))
+    yield ""
+
+    yield "## Action Items"
+    items = get("actionItems", [])
     if items:
         for it in items:
             owner = it.get("owner") or "—"
             due = it.get("dueDate") or "—"
             prio = it.get("priority") or "—"
-            parts.append(f"- Task: {it.get('task','')} | Owner: {owner} | Due: {due} | Priority: {prio}")
-    else:
-        parts.append("- —")
-    parts.append("")
-
-    parts.append("## Risks / Dependencies")
-    risks = mom.get("risks", [])
-    deps = mom.get("dependencies", [])
-    parts.append("- Risks:")
-    if risks:
-        for r in risks:
-            parts.append(f"  - {r}")
+            yield f"- Task: {it.get('task', '')} | Owner: {owner} | Due: {due} | Priority: {prio}"
     else:
-        parts.append("  - —")
-    parts.append("- Dependencies:")
-    if deps:
-        for d in deps:
-            parts.append(f"  - {d}")
-    else:
-        parts.append("  - —")
-    parts.append("")
-
-    parts.append("## Open Questions")
-    oq = mom.get("openQuestions", [])
-    if oq:
-        for q in oq:
-            parts.append(f"- {q}")
-    else:
-        parts.append("- —")
-    parts.append("")
-
-    parts.append("## Summary Overview")
-    summary = mom.get("summary", [])
-    if summary:
-        for s in summary:
-            parts.append(f"- {s}")
-    else:
-        parts.append("- —")
+        yield "- —"
+    yield ""
+
+    yield "## Risks / Dependencies"
+    yield "- Risks:"
+    yield from _bullets(get("risks", []), "  ")
+    yield "- Dependencies:"
+    yield from _bullets(get("dependencies", []), "  ")
+    yield ""
+
+    yield "## Open Questions"
+    yield from _bullets(get("openQuestions", []))
+    yield ""
+
+    yield "## Summary Overview"
+    yield from _bullets(get("summary", []))
+
+
+def render_markdown(mom: Dict, out: Optional[TextIO] = None) -> Optional[str]:
+    """Deterministic Markdown rendering of a MoM.
+
+    Returns the document, or, when `out` (an open text file) is given, writes
+    it there line by line without building the whole string and returns None.
+    """
+    lines = _iter_markdown(mom)
+    if out is None:
+        return "\n".join(lines)
+    out.writelines(itertools.chain([next(lines)], ("\n" + line for line in lines)))
+    return None
+
 
-    return "\n".join(parts)
+def write_markdown(mom: Dict, path) -> None:
+    """Render `mom` straight into the file at `path`."""
+    with open(path, "w", encoding="utf-8") as f:
+        render_markdown(mom, f)
@@ -0,0 +1,72 @@
+"""Shared OpenAI client with a persistent HTTP/2 connection pool.
+
+Every Whisper/chat call in a process goes through the same client, so repeated
+requests reuse one TLS session and concurrent uploads are multiplexed over it
+instead of each opening its own connection.
+"""
+import functools
+import os
+import threading
+from typing import Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+
+    _HTTP2 = True
+except Exception:
+    _HTTP2 = False
+
+_TIMEOUT = 120.0
+# Keep idle connections well past httpx's 5 s default: the gap between calls is
+# usually the user speaking, and a dropped connection means a new TLS handshake.
+_LIMITS = httpx.Limits(max_connections=8, max_keepalive_connections=8, keepalive_expiry=60.0)
+
+
+def get_client(api_key: Optional[str] = None) -> OpenAI:
+    """Return the process-wide client for `api_key` (default: OPENAI_API_KEY)."""
+    return _client_for_key(api_key or os.getenv("OPENAI_API_KEY"))
+
+
+_PREWARMED: Dict[Optional[str], threading.Thread] = {}
+_PREWARM_LOCK = threading.Lock()
+
+
+def prewarm(api_key: Optional[str] = None) -> threading.Thread:
+    """Open the shared client's HTTPS connection on a daemon thread.
+
+    Uses models.list(), which costs no tokens, so the TCP/TLS handshake
+    overlaps whatever the user is doing (reading, speaking) instead of
+    delaying the first real request. Errors are ignored; the real request
+    will report them. Runs once per key; later calls return the first thread.
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+
+    def run():
+        try:
+            get_client(api_key).models.list()
+        except Exception:
+            pass
+
+    with _PREWARM_LOCK:
+        t = _PREWARMED.get(api_key)
+        if t is None:
+            t = _PREWARMED[api_key] = threading.Thread(target=run, daemon=True)
+            t.start()
+        return t
+
+
+def new_async_client(api_key: Optional[str] = None) -> AsyncOpenAI:
+    """Build an AsyncOpenAI client on an HTTP/2 pool.
+    Not cached: an async pool is bound to the event loop that uses it.
+    """
+    http_client = httpx.AsyncClient(http2=_HTTP2, timeout=_TIMEOUT, limits=_LIMITS)
+    return AsyncOpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"), http_client=http_client)
+
+
+@functools.lru_cache(maxsize=4)
+def _client_for_key(api_key: Optional[str]) -> OpenAI:
+    http_client = httpx.Client(http2=_HTTP2, timeout=_TIMEOUT, limits=_LIMITS)
+    return OpenAI(api_key=api_key, http_client=http_client)
@@ -1,6 +1,15 @@
-from typing import Dict, List, Tuple
+import functools
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 
-from .utils import format_seconds
+from .config import MOM_MODEL
+from .utils import format_seconds_array
+
+try:
+    import tiktoken
+except Exception:
+    tiktoken = None
 
 
 FILLERS = {
@@ -15,61 +24,113 @@ FILLERS = {
     "okay",
 }
 
+# One pass per segment instead of two str.replace calls per filler; longest
+# first so "you know" is removed as a phrase, and \b keeps "like" out of "likely".
+# Words inside a phrase may be separated by any run of whitespace.
+_FILLER_RE = re.compile(
+    r"\b(?:"
+    + "|".join(r"\s+".join(map(re.escape, f.split())) for f in sorted(FILLERS, key=lambda f: (-len(f), f)))
+    + r")\b",
+    re.IGNORECASE,
+)
+_WS_RE = re.compile(r"\s+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+@dataclass(slots=True)
+class Segment:
+    """A cleaned transcript segment. orjson serialises it like the equivalent dict."""
+
+    start: float
+    end: float
+    start_ts: str
+    end_ts: str
+    text: str
+    speaker: Optional[str] = None  # do not hallucinate
+
 
 def _clean_segment_text(text: str) -> str:
-    t = text.strip()
-    # simple filler removal
-    for f in FILLERS:
-        t = t.replace(f, "")
-        t = t.replace(f.capitalize(), "")
-    # collapse double spaces
-    while "  " in t:
-        t = t.replace("  ", " ")
-    return t.strip()
-
-
-def normalize_segments(segments: List[Dict]) -> List[Dict]:
-    out = []
+    return _WS_RE.sub(" ", _FILLER_RE.sub("", text)).strip()
+
+
+def normalize_segments(segments: List[Dict]) -> List[Segment]:
+    return normalize_and_join(segments)[0]
+
+
+def normalize_and_join(segments: List[Dict]) -> Tuple[List[Segment], str]:
+    """Normalize raw segments and build the cleaned transcript in one pass.
+    Equivalent to normalize_segments followed by segments_to_text.
+    Returns (segments, text).
+    """
+    kept = []
     for s in segments:
         text = _clean_segment_text(s.get("text", ""))
-        if not text:
-            continue
-        start = float(s.get("start") or 0.0)
-        end = float(s.get("end") or 0.0)
-        out.append(
-            {
-                "start": start,
-                "end": end,
-                "start_ts": format_seconds(start),
-                "end_ts": format_seconds(end),
-                "text": text,
-                "speaker": None,  # do not hallucinate
-            }
-        )
-    return out
-
-
-def segments_to_text(segments: List[Dict]) -> str:
-    parts = []
-    for s in segments:
-        parts.append(s["text"])
-    return "\n".join(parts).strip()
+        if text:
+            kept.append((float(s.get("start") or 0.0), float(s.get("end") or 0.0), text))
+    if not kept:
+        return [], ""
+    starts, ends, texts = zip(*kept)
+    # Timestamps for every kept segment in two NumPy batches
+    out = [
+        Segment(*row)
+        for row in zip(starts, ends, format_seconds_array(starts), format_seconds_array(ends), texts)
+    ]
+    return out, "\n".join(texts).strip()
 
 
-def chunk_text(text: str, max_chars: int = 8000) -> List[str]:
-    # Safe chunking for long transcripts; split on paragraph boundaries
-    if len(text) <= max_chars:
+def segments_to_text(segments: List[Segment]) -> str:
+    return "\n".join(s.text for s in segments).strip()
+
+
+@functools.lru_cache(maxsize=4)
+def _encoding(model: str):
+    # Loading the BPE ranks is the slow part; do it once per model per process
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def _token_counter(model: str):
+    if tiktoken is None:
+        # Roughly four characters per token for English text
+        return lambda s: len(s) // 4 + 1
+    enc = _encoding(model)
+    return lambda s: len(enc.encode_ordinary(s))
+
+
+def chunk_text(text: str, max_tokens: int = 3000, model: str = MOM_MODEL) -> List[str]:
+    """Split a transcript into chunks of about `max_tokens` tokens for `model`.
+
+    Lines (one per segment) are packed whole; a line that alone exceeds the
+    budget is split on sentence boundaries. Token counts come from tiktoken when
+    it is installed, otherwise from a characters/4 estimate.
+    """
+    count = _token_counter(model)
+    if count(text) <= max_tokens:
         return [text]
+    # (piece, separator joining it to the previous piece)
+    units: List[Tuple[str, str]] = []
+    for line in text.splitlines():
+        if count(line) > max_tokens:
+            sentences = _SENTENCE_RE.split(line)
+            units.append((sentences[0], "\n"))
+            units.extend((sent, " ") for sent in sentences[1:])
+        else:
+            units.append((line, "\n"))
     chunks = []
-    buf = []
+    buf: List[str] = []
     size = 0
-    for line in text.splitlines():
-        if size + len(line) + 1 > max_chars:
-            chunks.append("\n".join(buf))
+    for piece, sep in units:
+        n = count(piece) + 1
+        if buf and size + n > max_tokens:
+            chunks.append("".join(buf))
             buf = []
             size = 0
-        buf.append(line)
-        size += len(line) + 1
+        if buf:
+            buf.append(sep)
+        buf.append(piece)
+        size += n
     if buf:
-        chunks.append("\n".join(buf))
+        chunks.append("".join(buf))
     return chunks
@@ -1,36 +1,50 @@
+import asyncio
 import os
-from typing import Dict, List, Tuple
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
-from tqdm import tqdm
-from openai import OpenAI
+from tqdm.asyncio import tqdm_asyncio
+from openai import AsyncOpenAI
 
 from .config import OPENAI_WHISPER_MODEL
-from .utils import Retry, ffprobe_duration
+from .openai_client import new_async_client
+from .utils import Retry, ffprobe_durations
 
 
-def _transcribe_one(client: OpenAI, file_path: str) -> Dict:
-    def call():
-        with open(file_path, "rb") as f:
-            return client.audio.transcriptions.create(
+MAX_CONCURRENT_UPLOADS = 4
+
+
+async def _transcribe_one_async(
+    client: AsyncOpenAI, file_path: str, sem: asyncio.Semaphore, language: Optional[str] = None
+) -> Dict:
+    extra = {"language": language} if language else {}
+
+    async with sem:
+        # Read off the event loop so one large chunk does not stall the other
+        # uploads; a file object would be read by httpx on the loop itself.
+        # Only max_concurrency chunks are held in memory at once.
+        data = await asyncio.to_thread(Path(file_path).read_bytes)
+
+        async def call():
+            return await client.audio.transcriptions.create(
                 model=OPENAI_WHISPER_MODEL,
-                file=f,
+                file=(os.path.basename(file_path), data),
                 response_format="verbose_json",
+                **extra,
             )
 
-    return Retry(attempts=3, base_delay=1.0, max_delay=8.0).run(call).model_dump()
+        result = await Retry(attempts=3, base_delay=1.0, max_delay=8.0).run_async(call)
+    return result.model_dump()
 
 
-def transcribe_files(chunk_paths: List[str]) -> Tuple[str, List[Dict]]:
-    """Transcribe chunk files with Whisper and merge segments with offsets.
-    Returns (raw_text, segments).
-    """
-    client = OpenAI()
+def _merge_results(
+    results: List[Dict], durations: List[Optional[float]]
+) -> Tuple[str, List[Dict], float]:
     raw_text_parts = []
     merged_segments = []
     offset = 0.0
 
-    for p in tqdm(chunk_paths, desc="Transcribing"):
-        result = _transcribe_one(client, p)
+    for result, dur in zip(results, durations):
         text = result.get("text", "")
         segments = result.get("segments", [])
 
@@ -42,7 +56,44 @@ def transcribe_files(chunk_paths: List[str]) -> Tuple[str, List[Dict]]:
             merged_segments.append(s2)
 
         raw_text_parts.append(text)
-        dur = ffprobe_duration(p) or 0.0
-        offset += dur
+        offset += dur or 0.0
+
+    # After the last chunk the running offset is the total duration
+    return ("\n".join(raw_text_parts).strip(), merged_segments, offset)
 
-    return ("\n".join(raw_text_parts).strip(), merged_segments)
+
+async def transcribe_files_async(
+    chunk_paths: List[str],
+    max_concurrency: int = MAX_CONCURRENT_UPLOADS,
+    language: Optional[str] = None,
+) -> Tuple[str, List[Dict], float]:
+    """Upload all chunks concurrently (at most max_concurrency in flight) and
+    merge segments with offsets in original chunk order.
+    `language` is an ISO-639-1 hint; None lets Whisper detect it.
+    Returns (raw_text, segments, duration_seconds).
+    """
+    client = new_async_client()
+    sem = asyncio.Semaphore(max_concurrency)
+    async with client:
+        # gather preserves input order, so results line up with chunk_paths
+        results = await tqdm_asyncio.gather(
+            *(_transcribe_one_async(client, p, sem, language) for p in chunk_paths),
+            desc="Transcribing",
+        )
+    # verbose_json reports each chunk's decoded length, trailing silence
+    # included (unlike the last segment's end); ffprobe only chunks without one
+    missing = [p for r, p in zip(results, chunk_paths) if not r.get("duration")]
+    probed = dict(zip(missing, await asyncio.to_thread(ffprobe_durations, missing)))
+    durations = [r.get("duration") or probed.get(p) for r, p in zip(results, chunk_paths)]
+    return _merge_results(results, durations)
+
+
+def transcribe_files(
+    chunk_paths: List[str], language: Optional[str] = None
+) -> Tuple[str, List[Dict], float]:
+    """Transcribe chunk files with Whisper and merge segments with offsets.
+    The total duration comes from Whisper's per-chunk report, so no chunk is
+    probed with ffprobe unless its reply lacks one.
+    Returns (raw_text, segments, duration_seconds).
+    """
+    return asyncio.run(transcribe_files_async(chunk_paths, language=language))
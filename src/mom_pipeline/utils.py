@@ -1,32 +1,48 @@
-import json
+import asyncio
+import functools
 import os
-import shlex
+import shutil
 import subprocess
 import time
-from datetime import datetime
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+import orjson
 
 
 def ensure_dir(path: str) -> None:
-    os.makedirs(path, exist_ok=True)
+    Path(path).mkdir(parents=True, exist_ok=True)
 
 
-def run_cmd(cmd: str) -> subprocess.CompletedProcess:
-    return subprocess.run(shlex.split(cmd), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+def run_cmd(cmd: List[str]) -> subprocess.CompletedProcess:
+    """Run an argv list directly (no shell), capturing stdout/stderr as text."""
+    return subprocess.run(cmd, capture_output=True, text=True)
 
 
+@functools.lru_cache(maxsize=1)
 def ffmpeg_available() -> bool:
-    return run_cmd("ffmpeg -version").returncode == 0 and run_cmd("ffprobe -version").returncode == 0
+    return shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
 
 
 def format_seconds(seconds: float) -> str:
-    # Format as HH:MM:SS.mmm
-    millis = int((seconds - int(seconds)) * 1000)
-    s = int(seconds)
-    h = s // 3600
-    m = (s % 3600) // 60
-    sec = s % 60
-    return f"{h:02d}:{m:02d}:{sec:02d}.{millis:03d}"
+    # Format as HH:MM:SS.mmm (milliseconds truncated)
+    s, millis = divmod(int(seconds * 1000), 1000)
+    m, sec = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return "%02d:%02d:%02d.%03d" % (h, m, sec, millis)
+
+
+def format_seconds_array(seconds) -> List[str]:
+    """format_seconds for a whole array of times, with the arithmetic done in NumPy."""
+    # Imported here so importing utils (e.g. from the lazy-prompt CLI) stays light
+    import numpy as np
+
+    s, millis = np.divmod((np.asarray(seconds, dtype=np.float64) * 1000).astype(np.int64), 1000)
+    m, sec = np.divmod(s, 60)
+    h, m = np.divmod(m, 60)
+    return ["%02d:%02d:%02d.%03d" % t for t in zip(h.tolist(), m.tolist(), sec.tolist(), millis.tolist())]
 
 
 def size_to_str(num_bytes: int) -> str:
@@ -38,23 +54,78 @@ def size_to_str(num_bytes: int) -> str:
 
 
 def ffprobe_duration(file_path: str) -> Optional[float]:
-    cmd = f"ffprobe -v error -show_entries format=duration -of default=noprint_wrappers=1:nokey=1 \"{file_path}\""
-    proc = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    """Duration in seconds via ffprobe, memoized per (path, mtime, size)."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return _ffprobe_duration(os.fspath(file_path), st.st_mtime_ns, st.st_size)
+
+
+def ffprobe_durations(paths: List[str], max_workers: int = 8) -> List[Optional[float]]:
+    """ffprobe_duration for many files, probed concurrently; results follow `paths` order."""
+    if len(paths) <= 1:
+        return [ffprobe_duration(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as ex:
+        return list(ex.map(ffprobe_duration, paths))
+
+
+@functools.lru_cache(maxsize=256)
+def _ffprobe_duration(file_path: str, mtime_ns: int, size: int) -> Optional[float]:
+    # mtime_ns/size are part of the cache key so a rewritten file is re-probed
+    try:
+        proc = subprocess.run(
+            [
+                "ffprobe", "-v", "error",
+                "-show_entries", "format=duration",
+                "-of", "default=noprint_wrappers=1:nokey=1",
+                file_path,
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+    except OSError:
+        return None
     if proc.returncode != 0:
         return None
     try:
-        return float(proc.stdout.strip())
-    except Exception:
+        return float(proc.stdout)
+    except ValueError:
         return None
 
 
 def safe_json_dump(data, path: str) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-
-def now_ts() -> str:
-    return datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    # orjson writes UTF-8 bytes directly and handles NumPy scalars/arrays.
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+
+
+def write_files(out_dir: str, files: List[Tuple[str, Any]]) -> None:
+    """Write several output files into out_dir concurrently.
+    Each entry is (filename, content): bytes are written as-is, str as UTF-8
+    text, a callable is invoked with the target path, and anything else is
+    written as JSON via safe_json_dump.
+    """
+    def write(item):
+        name, content = item
+        path = Path(out_dir, name)
+        if callable(content):
+            content(path)
+        elif isinstance(content, bytes):
+            path.write_bytes(content)
+        elif isinstance(content, str):
+            path.write_text(content, encoding="utf-8")
+        else:
+            safe_json_dump(content, path)
+
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        # list() re-raises the first write error, if any
+        list(ex.map(write, files))
+
+
+def now_ts(dt: Optional[datetime] = None) -> str:
+    return (dt or datetime.now(timezone.utc)).strftime("%Y%m%d_%H%M%S")
 
 
 class Retry:
@@ -77,3 +148,15 @@ class Retry:
                 time.sleep(delay)
         if last_exc:
             raise last_exc
+
+    async def run_async(self, fn):
+        """Like run(), but awaits `fn()` and sleeps without blocking the event loop."""
+        last_exc = None
+        for i in range(self.attempts):
+            try:
+                return await fn()
+            except Exception as e:
+                last_exc = e
+                await asyncio.sleep(self.backoff(i))
+        if last_exc:
+            raise last_exc
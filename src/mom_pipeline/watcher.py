@@ -4,6 +4,8 @@ import sys
 import time
 import threading
 import subprocess
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Set
 
 from watchdog.observers import Observer
@@ -11,6 +13,10 @@ from watchdog.events import FileSystemEventHandler
 
 from .config import ALLOWED_AUDIO_EXTS, ALLOWED_VIDEO_EXTS
 
+# Repeat events for a path seen this recently (watchdog can report one large
+# recording as created more than once) are ignored.
+RECENT_TTL_SECS = 60
+
 
 def _ext(path: str) -> str:
     return os.path.splitext(path.lower())[1]
@@ -21,10 +27,68 @@ def _is_supported(path: str) -> bool:
     return e in ALLOWED_AUDIO_EXTS or e in ALLOWED_VIDEO_EXTS
 
 
+class _WriteTracker(FileSystemEventHandler):
+    """Flags every create/modify/move event that touches one path."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = os.path.abspath(path)
+        self.changed = threading.Event()
+
+    def _touch(self, *paths):
+        if any(p and os.path.abspath(p) == self.path for p in paths):
+            self.changed.set()
+
+    def on_created(self, event):
+        self._touch(event.src_path)
+
+    def on_modified(self, event):
+        self._touch(event.src_path)
+
+    def on_moved(self, event):
+        self._touch(event.src_path, event.dest_path)
+
+
 def wait_for_stable(path: str, min_stable_secs: int = 10, timeout_secs: int = 600) -> bool:
-    """Wait until a file's size stops changing for min_stable_secs or timeout.
+    """Wait until a file has gone min_stable_secs without a write, or timeout.
+    Writes are observed through filesystem events, so stability is reported as
+    soon as the quiet period ends; falls back to polling the size once a second
+    when the directory cannot be watched.
     Returns True if stable, False if timeout.
     """
+    tracker = _WriteTracker(path)
+    observer = Observer()
+    try:
+        observer.schedule(tracker, os.path.dirname(tracker.path), recursive=False)
+        observer.start()
+    except Exception:
+        return _poll_for_stable(path, min_stable_secs, timeout_secs)
+    try:
+        deadline = time.monotonic() + timeout_secs
+        while True:
+            tracker.changed.clear()
+            size = _size_or_none(path)
+            remaining = deadline - time.monotonic()
+            if tracker.changed.wait(min(min_stable_secs, max(remaining, 0))):
+                continue
+            if remaining < min_stable_secs:
+                return False
+            # Size check guards against events the backend coalesced or dropped
+            if size is not None and _size_or_none(path) == size:
+                return True
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def _size_or_none(path: str):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def _poll_for_stable(path: str, min_stable_secs: int = 10, timeout_secs: int = 600) -> bool:
     start = time.time()
     last_size = -1
     stable_since = None
@@ -47,23 +111,48 @@ def wait_for_stable(path: str, min_stable_secs: int = 10, timeout_secs: int = 60
 
 
 class Handler(FileSystemEventHandler):
-    def __init__(self, output_dir: str, title_prefix: str, participants: str):
+    def __init__(self, output_dir: str, title_prefix: str, participants: str, max_workers: int = 2):
         super().__init__()
         self.output_dir = output_dir
         self.title_prefix = title_prefix
         self.participants = participants
+        # processing/_recent are shared by the observer thread and the workers
+        self._lock = threading.Lock()
         self.processing: Set[str] = set()
+        self._recent: "OrderedDict[str, float]" = OrderedDict()
+        # Bounded, so a burst of recordings queues instead of running N pipelines at once
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mom-watch")
 
     def on_created(self, event):
         if event.is_directory:
             return
-        path = event.src_path
+        path = os.path.realpath(event.src_path)
         if not _is_supported(path):
             return
-        if path in self.processing:
+        if not self._claim(path):
             return
-        self.processing.add(path)
-        threading.Thread(target=self._process_file, args=(path,), daemon=True).start()
+        self._pool.submit(self._process_file, path)
+
+    def _claim(self, path: str) -> bool:
+        """Mark `path` as in progress; False if it already is or was handled recently."""
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and next(iter(self._recent.values())) < now - RECENT_TTL_SECS:
+                self._recent.popitem(last=False)
+            if path in self.processing or path in self._recent:
+                return False
+            self.processing.add(path)
+            return True
+
+    def _release(self, path: str) -> None:
+        with self._lock:
+            self.processing.discard(path)
+            self._recent[path] = time.monotonic()
+            self._recent.move_to_end(path)
+
+    def shutdown(self) -> None:
+        """Drop queued recordings and wait for the ones already being processed."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
 
     def _process_file(self, path: str):
         try:
@@ -91,7 +180,7 @@ class Handler(FileSystemEventHandler):
             else:
                 print(proc.stdout)
         finally:
-            self.processing.discard(path)
+            self._release(path)
 
 
 def main():
@@ -117,6 +206,7 @@ def main():
     except KeyboardInterrupt:
         observer.stop()
     observer.join()
+    handler.shutdown()
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 import sys
 from pathlib import Path
 from unittest.mock import patch, MagicMock
+import numpy as np
 import pytest
 
 # Add src to path
@@ -14,17 +15,23 @@ from lazy_prompt.interactive import (
 )
 
 
+def _fake_incremental_capture(transcribe, **kwargs):
+    """Stand-in for stream_audio_incremental: one transcription of silent audio."""
+    return transcribe(np.zeros(16000, dtype=np.float32))[0]
+
+
 def test_interactive_refinement_flow_with_mocked_audio():
     """Test the full interactive refinement flow with mocked audio."""
     
     # Mock audio capture and transcription
-    with patch("lazy_prompt.interactive.stream_audio_auto_stop") as mock_stream, \
+    with patch("lazy_prompt.interactive.stream_audio_incremental") as mock_stream, \
          patch("lazy_prompt.interactive.transcribe_audio") as mock_transcribe, \
-         patch("lazy_prompt.interactive.OpenAI") as mock_openai_class, \
-         patch("lazy_prompt.interactive._speak_text") as mock_tts:
+         patch("lazy_prompt.interactive.get_client") as mock_get_client, \
+         patch("lazy_prompt.interactive._speak_text") as mock_tts, \
+         patch("lazy_prompt.interactive.prewarm") as mock_prewarm:
         
         # Setup mock audio capture
-        mock_stream.return_value = b"mock_audio_data"
+        mock_stream.side_effect = _fake_incremental_capture
         
         # Setup mock transcription for dialogue turns
         # Turn 1: user answer, Turn 2: user says DONE
@@ -60,14 +67,15 @@ Build a machine learning classifier to categorize images.
 - Model accuracy > 90%"""
         
         mock_client.chat.completions.create.side_effect = [response1, response2, response3]
-        mock_openai_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
         
         # Run the flow
         initial_prompt = "I want to build an image classifier"
         result = interactive_refinement_flow(
             initial_prompt,
             language="en",
-            api_key="test-api-key"
+            api_key="test-api-key",
+            use_cache=False,
         )
         
         # Verify results
@@ -76,17 +84,18 @@ Build a machine learning classifier to categorize images.
         assert mock_transcribe.called
         assert mock_client.chat.completions.create.called
         mock_tts.assert_called()
+        mock_prewarm.assert_called_once_with("test-api-key")
 
 
 def test_interactive_dialogue_session_basic():
     """Test the interactive dialogue session with mocked input."""
     
-    with patch("lazy_prompt.interactive.stream_audio_auto_stop") as mock_stream, \
+    with patch("lazy_prompt.interactive.stream_audio_incremental") as mock_stream, \
          patch("lazy_prompt.interactive.transcribe_audio") as mock_transcribe, \
-         patch("lazy_prompt.interactive.OpenAI") as mock_openai_class, \
+         patch("lazy_prompt.interactive.get_client") as mock_get_client, \
          patch("lazy_prompt.interactive._speak_text") as mock_tts:
         
-        mock_stream.return_value = b"mock_audio"
+        mock_stream.side_effect = _fake_incremental_capture
         # First transcription: user's answer, Second: user says DONE
         mock_transcribe.side_effect = [
             ("I need a REST API", ["I need a REST API"]),
@@ -101,12 +110,13 @@ def test_interactive_dialogue_session_basic():
         response2.choices[0].message.content = "What authentication method?"
         
         mock_client.chat.completions.create.side_effect = [response1, response2]
-        mock_openai_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
         
         history, combined_text = interactive_dialogue_session(
             initial_prompt="Build an API",
             language="en",
-            api_key="test-key"
+            api_key="test-key",
+            use_cache=False,
         )
         
         # Check the combined transcript contains user inputs
@@ -121,13 +131,13 @@ def test_interactive_dialogue_session_basic():
 def test_generate_refined_prompt():
     """Test the refined prompt generation function."""
     
-    with patch("lazy_prompt.interactive.OpenAI") as mock_openai_class:
+    with patch("lazy_prompt.interactive.get_client") as mock_get_client:
         # Setup mock
         mock_client = MagicMock()
         mock_response = MagicMock()
         mock_response.choices[0].message.content = "# Refined Prompt\n\nYour detailed prompt here..."
         mock_client.chat.completions.create.return_value = mock_response
-        mock_openai_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
         
         # Create a simple conversation history
         conversation = [
@@ -140,7 +150,8 @@ def test_generate_refined_prompt():
         result = generate_refined_prompt(
             conversation,
             "I need a REST API. PostgreSQL",
-            api_key="test-key"
+            api_key="test-key",
+            use_cache=False,
         )
         
         assert "Refined Prompt" in result
@@ -0,0 +1,58 @@
+"""Test transcribe_while_recording's handling of Ctrl+C."""
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mom_pipeline.live_transcribe import transcribe_while_recording
+
+SAMPLE_RATE = 16000
+
+
+class _InterruptedCapture:
+    """Stands in for stream_audio_chunks: Ctrl+C arrives in the caller after
+    two windows, then the partial window is flushed once stop is set."""
+
+    def __init__(self, stop_event):
+        self.stop_event = stop_event
+        self.pulled = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        self.pulled += 1
+        if self.pulled <= 2:
+            return np.full(SAMPLE_RATE, 0.1 * self.pulled, dtype=np.float32)
+        if self.pulled == 3:
+            raise KeyboardInterrupt
+        if self.pulled == 4 and self.stop_event.is_set():
+            return np.full(SAMPLE_RATE // 2, 0.3, dtype=np.float32)
+        raise StopIteration
+
+    def close(self):
+        pass
+
+
+def test_ctrl_c_keeps_captured_audio_and_transcript():
+    transcribed = []
+
+    def fake_transcribe(wav_bytes, language):
+        transcribed.append(wav_bytes)
+        n = len(transcribed)
+        return f"part {n}", [{"start": 0.0, "end": 0.5, "text": f"part {n}"}]
+
+    with patch(
+        "mom_pipeline.live_transcribe.stream_audio_chunks",
+        side_effect=lambda *a, stop_event, **kw: _InterruptedCapture(stop_event),
+    ), patch("mom_pipeline.live_transcribe.transcribe_audio", side_effect=fake_transcribe):
+        audio_bytes, text, segments = transcribe_while_recording(sample_rate=SAMPLE_RATE)
+
+    assert text == "part 1 part 2 part 3"
+    assert [s["start"] for s in segments] == [0.0, 1.0, 2.0]
+    # 44-byte WAV header + 2.5 s of int16 samples
+    assert len(audio_bytes) == 44 + int(2.5 * SAMPLE_RATE) * 2
@@ -0,0 +1,23 @@
+"""Test transcript clean-up in mom_pipeline.postprocess."""
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mom_pipeline.postprocess import _clean_segment_text, normalize_and_join
+
+
+def test_fillers_removed_on_word_boundaries_only():
+    assert _clean_segment_text("Um, you  know, it is likely\tkind of unlike OKAY") == ", , it is likely unlike"
+    assert _clean_segment_text("Alright, the bright side") == "Alright, the bright side"
+
+
+def test_normalize_and_join_drops_empty_segments():
+    segments, text = normalize_and_join([
+        {"start": 0.0, "end": 1.0, "text": "uh"},
+        {"start": 61.25, "end": 3661.5, "text": " Ship it "},
+    ])
+
+    assert text == "Ship it"
+    assert [(s.start_ts, s.end_ts, s.text) for s in segments] == [("00:01:01.250", "01:01:01.500", "Ship it")]
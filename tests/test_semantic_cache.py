@@ -0,0 +1,39 @@
+"""Test the semantic cache used by the interactive refiner."""
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from lazy_prompt import semantic_cache
+from lazy_prompt.semantic_cache import SemanticCache, cached_chat_completion, context_digest
+
+
+def test_lookup_matches_paraphrase_only_in_same_context(tmp_path):
+    cache = SemanticCache(directory=tmp_path)
+    ctx = context_digest("gpt-4o", [{"role": "system", "content": "s"}, {"role": "user", "content": "q"}])
+    other = context_digest("gpt-4o", [{"role": "system", "content": "other"}, {"role": "user", "content": "q"}])
+
+    cache.store(ctx, np.array([1.0, 0.0, 0.0]), "cached answer")
+
+    assert cache.lookup(ctx, np.array([0.99, 0.05, 0.0])) == "cached answer"
+    assert cache.lookup(ctx, np.array([0.0, 1.0, 0.0])) is None
+    assert cache.lookup(other, np.array([1.0, 0.0, 0.0])) is None
+
+
+def test_cached_chat_completion_skips_chat_call_on_hit(tmp_path, monkeypatch):
+    monkeypatch.setattr(semantic_cache, "_CACHE", SemanticCache(directory=tmp_path))
+
+    client = MagicMock()
+    client.embeddings.create.return_value.data[0].embedding = [0.6, 0.8]
+    response = MagicMock()
+    response.choices[0].message.content = "What database?"
+    client.chat.completions.create.return_value = response
+
+    messages = [{"role": "system", "content": "s"}, {"role": "user", "content": "Build an API"}]
+    assert cached_chat_completion(client, messages) == "What database?"
+    assert cached_chat_completion(client, messages) == "What database?"
+    assert client.chat.completions.create.call_count == 1
@@ -0,0 +1,50 @@
+"""Test the silence gate in front of transcription."""
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mom_pipeline.live_capture import _array_to_wav, _preprocess_audio
+from mom_pipeline.live_transcribe import _has_speech, transcribe_audio
+
+SAMPLE_RATE = 16000
+
+
+def test_preprocessed_noise_floor_is_skipped():
+    rng = np.random.default_rng(0)
+    noise = rng.normal(0.0, 0.002, 3 * SAMPLE_RATE).astype(np.float32)
+
+    audio = _preprocess_audio(noise, SAMPLE_RATE)
+
+    assert not _has_speech(audio)
+    assert not _has_speech(_array_to_wav(audio, SAMPLE_RATE))
+    with patch("mom_pipeline.live_transcribe.get_client") as get_client:
+        assert transcribe_audio(_array_to_wav(audio, SAMPLE_RATE)) == ("", [])
+    get_client.assert_not_called()
+
+
+def test_preprocessed_speech_level_passes():
+    t = np.arange(3 * SAMPLE_RATE) / SAMPLE_RATE
+    tone = (0.1 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+    assert _has_speech(_array_to_wav(_preprocess_audio(tone, SAMPLE_RATE), SAMPLE_RATE))
+
+
+def test_short_utterance_in_long_quiet_clip_passes():
+    rng = np.random.default_rng(1)
+    for speech_seconds, clip_seconds, dbfs in [(1.0, 30, -30), (1.5, 30, -34), (3.0, 120, -34)]:
+        clip = rng.normal(0.0, 0.002, clip_seconds * SAMPLE_RATE).astype(np.float32)
+        t = np.arange(int(speech_seconds * SAMPLE_RATE)) / SAMPLE_RATE
+        amplitude = np.sqrt(2) * 10 ** (dbfs / 20)  # sine RMS at `dbfs`
+        start = 10 * SAMPLE_RATE
+        clip[start:start + t.size] += (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+        audio = _preprocess_audio(clip, SAMPLE_RATE)
+
+        assert _has_speech(audio)
+        assert _has_speech(_array_to_wav(audio, SAMPLE_RATE))
+        assert np.abs(audio).max() > 0.5  # normalized like any other speech capture